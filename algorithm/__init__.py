@@ -0,0 +1,41 @@
+"""
+查找算法包
+    from algorithm import binary_search, lower_bound, EytzingerIndex, SortedArray
+
+导入包本身不做任何事：用到哪个名字才导入对应的模块（numpy 也是真正用到时才导入）。
+包里的脚本（bench_*.py）还是在这个目录下直接运行：python bench_suite.py
+"""
+
+import importlib
+
+# 名字 -> 所在的模块
+_EXPORTS = {
+    'binary_search': 'binary_search',
+    'binary_search_many': 'binary_search',
+    'lower_bound': 'binary_search',
+    'upper_bound': 'binary_search',
+    'equal_range': 'binary_search',
+    'count_in_range': 'binary_search',
+    'nearest': 'binary_search',
+    'EytzingerIndex': 'eytzinger',
+    'SortedArray': 'sorted_array',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module = importlib.import_module(f'{__name__}.{module_name}')
+    # 这个模块导出的名字一次全部放进包里，下次不用再走 __getattr__；
+    # 导入子模块时 Python 会把 algorithm.binary_search 设成子模块本身，这里也顺便改回同名函数
+    for export, source in _EXPORTS.items():
+        if source == module_name:
+            globals()[export] = getattr(module, export)
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
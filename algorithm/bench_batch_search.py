@@ -0,0 +1,67 @@
+"""
+批量二分查找性能测试
+在 100 万个元素的有序数组里查 10^3 ~ 10^7 个目标，对比：
+  - Python 循环调用 binary_search
+  - binary_search_many（普通列表，bisect）
+  - binary_search_many（numpy 数组，searchsorted）
+循环版在 10^7 时要跑很久，默认跳过，加 --full 参数才跑
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from binary_search import binary_search, binary_search_many
+
+ARRAY_SIZE = 1_000_000
+LOOP_LIMIT = 1_000_000
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def python_loop(arr, targets):
+    return [binary_search(arr, target) for target in targets]
+
+
+if __name__ == "__main__":
+    full = '--full' in sys.argv
+    random.seed(42)
+
+    # 偶数组成的有序数组，目标一半是偶数（能找到）一半是奇数（找不到）
+    array_list = list(range(0, 2 * ARRAY_SIZE, 2))
+    array_np = np.array(array_list)
+
+    print("=" * 70)
+    print(f"有序数组大小: {ARRAY_SIZE:,}")
+    print(f"{'目标数':>12} {'Python循环':>12} {'列表+bisect':>12} {'numpy':>12} {'numpy加速':>10}")
+    print("=" * 70)
+
+    for exponent in range(3, 8):
+        count = 10 ** exponent
+        targets_np = np.random.default_rng(exponent).integers(0, 2 * ARRAY_SIZE, count)
+        targets_list = targets_np.tolist()
+
+        numpy_time, numpy_result = timed(binary_search_many, array_np, targets_np)
+        list_time, list_result = timed(binary_search_many, array_list, targets_list)
+
+        # 两种实现的结果要一致（-1 对应 None）
+        assert [None if i == -1 else i for i in numpy_result.tolist()] == list_result
+
+        if count <= LOOP_LIMIT or full:
+            loop_time, loop_result = timed(python_loop, array_list, targets_list)
+            assert loop_result == list_result
+            loop_text = f"{loop_time:>11.3f}s"
+            speedup = f"{loop_time / numpy_time:>9.0f}x"
+        else:
+            loop_text = f"{'(跳过)':>11}"
+            speedup = f"{'-':>10}"
+
+        print(f"{count:>12,} {loop_text} {list_time:>11.3f}s {numpy_time:>11.3f}s {speedup}")
+
+    print("=" * 70)
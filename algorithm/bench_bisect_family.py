@@ -0,0 +1,80 @@
+"""
+bisect 家族性能测试
+在 100 万个元素（有重复）的有序列表上，对比：
+  - 单点查找：binary_search（纯 Python）vs lower_bound（C 实现的 bisect）
+  - 范围计数：线性扫描 vs count_in_range
+  - 带 key 的查找：lower_bound(key=...) vs 预先算好 key 列表
+"""
+
+import random
+import time
+
+from binary_search import binary_search, count_in_range, lower_bound, nearest
+
+ARRAY_SIZE = 1_000_000
+LOOKUPS = 100_000
+RANGE_QUERIES = 20
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def report(name, baseline, optimized):
+    print(f"{name:<28} {baseline:>10.4f}s {optimized:>10.4f}s {baseline / optimized:>8.1f}x")
+
+
+if __name__ == "__main__":
+    random.seed(42)
+    arr = sorted(random.randrange(ARRAY_SIZE // 4) for _ in range(ARRAY_SIZE))
+    targets = [random.randrange(ARRAY_SIZE // 4) for _ in range(LOOKUPS)]
+
+    print("=" * 62)
+    print(f"有序列表 {ARRAY_SIZE:,} 个元素（约 4 个一组重复）")
+    print(f"{'场景':<28} {'原来的写法':>11} {'新API':>11} {'加速':>9}")
+    print("=" * 62)
+
+    # 1. 单点查找
+    baseline, _ = timed(lambda: [binary_search(arr, t) for t in targets])
+    optimized, _ = timed(lambda: [lower_bound(arr, t) for t in targets])
+    report(f"查找 x{LOOKUPS:,}", baseline, optimized)
+
+    # 2. 范围计数：没有 count_in_range 时只能线性扫描
+    ranges = []
+    for _ in range(RANGE_QUERIES):
+        lo = random.randrange(ARRAY_SIZE // 4)
+        ranges.append((lo, lo + random.randrange(1000)))
+    baseline, expected = timed(
+        lambda: [sum(1 for x in arr if lo <= x <= hi) for lo, hi in ranges]
+    )
+    optimized, counted = timed(lambda: [count_in_range(arr, lo, hi) for lo, hi in ranges])
+    assert expected == counted
+    report(f"范围计数 x{RANGE_QUERIES}", baseline, optimized)
+
+    # 3. 最近邻：线性扫描 vs nearest
+    probes = targets[:RANGE_QUERIES]
+    baseline, _ = timed(
+        lambda: [min(range(len(arr)), key=lambda i: abs(arr[i] - t)) for t in probes]
+    )
+    optimized, _ = timed(lambda: [nearest(arr, t) for t in probes])
+    report(f"最近邻 x{RANGE_QUERIES}", baseline, optimized)
+
+    # 4. 带 key：每次比较都调用 key 函数 vs 提前算好一份 key 列表（含计算 key 列表的时间）
+    records = [{'score': x} for x in arr]
+
+    def search_with_key():
+        return [lower_bound(records, t, key=lambda record: record['score']) for t in targets]
+
+    def search_precomputed():
+        scores = [record['score'] for record in records]
+        return [lower_bound(scores, t) for t in targets]
+
+    with_key, first = timed(search_with_key)
+    precomputed, second = timed(search_precomputed)
+    assert first == second
+    report(f"key= → 预算key x{LOOKUPS:,}", with_key, precomputed)
+
+    print("=" * 62)
+    print("💡 查询很多次时，提前算好 key 列表再查，比每次传 key= 更快")
@@ -0,0 +1,58 @@
+"""
+Eytzinger 索引性能测试
+数组从 512KB（在 L2 里）一直到 128MB（远超 L3），随机查 100 万个目标，对比：
+  - binary_search_many（numpy searchsorted，普通有序布局）
+  - EytzingerIndex.search_many（BFS 布局，一层一层批量往下走）
+  - 单个查找：binary_search vs EytzingerIndex.search（各 10 万次）
+"""
+
+import time
+
+import numpy as np
+
+from binary_search import binary_search, binary_search_many
+from eytzinger import EytzingerIndex
+
+BATCH = 1_000_000
+SINGLE = 100_000
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(42)
+
+    print("=" * 84)
+    print(f"{'数组大小':>12} {'内存':>8} {'建索引':>8} {'searchsorted':>13} {'Eytzinger批量':>14}"
+          f" {'binary_search':>14} {'Eytzinger单个':>14}")
+    print("=" * 84)
+
+    for exponent in (16, 20, 23, 24):
+        size = 1 << exponent
+        arr = np.sort(rng.integers(0, size * 4, size))
+        targets = rng.integers(0, size * 4, BATCH)
+
+        build_time, index = timed(EytzingerIndex, arr)
+        sorted_time, expected = timed(binary_search_many, arr, targets)
+        eytz_time, result = timed(index.search_many, targets)
+
+        # 有重复元素时两边都返回第一个匹配的位置
+        assert (expected == result).all()
+
+        arr_list = arr.tolist()
+        singles = targets[:SINGLE].tolist()
+        index.search(0)  # 先把单个查找用的列表建好，不算进耗时
+        loop_time, _ = timed(lambda: [binary_search(arr_list, t) for t in singles])
+        single_time, _ = timed(lambda: [index.search(t) for t in singles])
+
+        print(f"{size:>12,} {arr.nbytes / 2**20:>6.1f}MB {build_time:>7.2f}s"
+              f" {sorted_time:>12.3f}s {eytz_time:>13.3f}s"
+              f" {loop_time:>13.3f}s {single_time:>13.3f}s")
+
+    print("=" * 84)
+    print("💡 数组超出缓存后，Eytzinger 的前十几层始终在缓存里，批量查找比 searchsorted 受影响小")
+    print("   纯 Python 的单个查找主要耗时在解释器上，布局的差别体现不出来")
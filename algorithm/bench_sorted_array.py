@@ -0,0 +1,73 @@
+"""
+SortedArray 性能测试
+先批量加载 10^6 个元素，再跑插入/查找混合的负载，对比：
+  - 普通列表：bisect.insort 插入（O(n) 挪动）+ binary_search 查找
+  - SortedArray：分块插入 + 分块查找
+"""
+
+import random
+import time
+from bisect import insort
+
+from binary_search import binary_search
+from sorted_array import SortedArray
+
+INITIAL = 1_000_000
+OPERATIONS = 50_000
+
+
+def make_workload(insert_ratio, seed=42):
+    rng = random.Random(seed)
+    return [
+        ('add' if rng.random() < insert_ratio else 'find', rng.randrange(INITIAL * 4))
+        for _ in range(OPERATIONS)
+    ]
+
+
+def run_list(initial, workload):
+    arr = sorted(initial)
+    found = 0
+    start = time.perf_counter()
+    for op, value in workload:
+        if op == 'add':
+            insort(arr, value)
+        elif binary_search(arr, value) is not None:
+            found += 1
+    return time.perf_counter() - start, found
+
+
+def run_sorted_array(initial, workload):
+    container = SortedArray(initial)
+    found = 0
+    start = time.perf_counter()
+    for op, value in workload:
+        if op == 'add':
+            container.add(value)
+        elif container.search(value) is not None:
+            found += 1
+    return time.perf_counter() - start, found
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    initial = [rng.randrange(INITIAL * 4) for _ in range(INITIAL)]
+
+    start = time.perf_counter()
+    SortedArray(initial)
+    print(f"批量加载 {INITIAL:,} 个元素: {time.perf_counter() - start:.2f}s\n")
+
+    print("=" * 60)
+    print(f"{OPERATIONS:,} 次操作")
+    print(f"{'插入占比':>8} {'list+insort':>14} {'SortedArray':>14} {'加速':>8}")
+    print("=" * 60)
+
+    for insert_ratio in (0.1, 0.5, 0.9):
+        workload = make_workload(insert_ratio)
+        list_time, list_found = run_list(initial, workload)
+        sa_time, sa_found = run_sorted_array(initial, workload)
+        assert list_found == sa_found
+
+        print(f"{insert_ratio:>8.0%} {list_time:>13.3f}s {sa_time:>13.3f}s"
+              f" {list_time / sa_time:>7.1f}x")
+
+    print("=" * 60)
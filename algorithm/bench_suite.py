@@ -0,0 +1,366 @@
+"""
+查找算法基准测试套件（带回归检测）
+把所有查找实现放在同一套数据上比较：
+  实现：binary_search、lower_bound（bisect）、binary_search_many（列表 / numpy）、
+        EytzingerIndex.search / search_many、SortedArray.search
+  数组大小：默认 1千 / 10万 / 100万
+  数据分布：uniform（均匀）、skewed（集中在小的一端，长尾）、duplicates（约 100 个一组重复）
+  命中率：0（全部查不到）、0.5、1（全部查得到）
+
+每个场景先检查结果是否正确，再重复跑几次取最快的一次，记录"每次查找多少纳秒"。
+结果可以存成JSON；和保存的基线比较时，慢了超过阈值（默认 15%）的场景会列出来，退出码为 1。
+
+    python bench_suite.py --update-baseline          # 跑一遍，存为基线 bench_baseline.json
+    python bench_suite.py                            # 再跑一遍，和基线比较
+    python bench_suite.py --quick --impls binary_search,lower_bound --output now.json
+    python bench_suite.py --compare now.json         # 不跑测试，直接拿已有结果和基线比较
+
+基线和机器、Python / numpy 版本有关，只在同一台机器上比较才有意义，所以不提交到仓库。
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+from binary_search import binary_search, binary_search_many, lower_bound
+from eytzinger import EytzingerIndex
+from sorted_array import SortedArray
+
+try:
+    import numpy as np
+except ImportError:  # 没装 numpy 时跳过 numpy 的实现
+    np = None
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_baseline.json')
+
+SIZES = (1_000, 100_000, 1_000_000)
+QUICK_SIZES = (1_000, 100_000)
+DISTRIBUTIONS = ('uniform', 'skewed', 'duplicates')
+HIT_RATIOS = (0.0, 0.5, 1.0)
+LOOKUPS = 20_000
+REPEAT = 5
+THRESHOLD = 0.15
+
+
+# ============ 测试数据 ============
+# 数组里都是偶数，查不到的目标取奇数，这样命中率可以精确控制
+
+def make_array(size, distribution, rng):
+    if distribution == 'uniform':
+        values = [rng.randrange(size * 4) for _ in range(size)]
+    elif distribution == 'skewed':
+        # 指数分布：大部分值挤在开头，少数很大的值拉出长尾
+        values = [int(rng.expovariate(8 / size)) for _ in range(size)]
+    elif distribution == 'duplicates':
+        values = [rng.randrange(size // 100 + 1) for _ in range(size)]
+    else:
+        raise ValueError(f'未知的数据分布: {distribution}')
+    return sorted(value * 2 for value in values)
+
+
+def make_targets(arr, hit_ratio, count, rng):
+    # 查得到的从数组里抽（和数据同分布），查不到的在整个取值范围里随机取奇数
+    low, high = arr[0] - 1, arr[-1] + 2
+    targets = []
+    for _ in range(count):
+        if rng.random() < hit_ratio:
+            targets.append(arr[rng.randrange(len(arr))])
+        else:
+            targets.append(rng.randrange(low, high) | 1)
+    return targets
+
+
+# ============ 被测的实现 ============
+# 每个实现是 prepare(arr) -> query(targets)：建索引的时间不算在查找时间里
+
+def _prepare_binary_search(arr):
+    return lambda targets: [binary_search(arr, t) for t in targets]
+
+
+def _prepare_lower_bound(arr):
+    return lambda targets: [lower_bound(arr, t) for t in targets]
+
+
+def _prepare_many_list(arr):
+    return lambda targets: binary_search_many(arr, targets)
+
+
+def _prepare_many_numpy(arr):
+    values = np.asarray(arr)
+    return lambda targets: binary_search_many(values, targets)
+
+
+def _prepare_eytzinger(arr):
+    index = EytzingerIndex(arr)
+    return lambda targets: [index.search(t) for t in targets]
+
+
+def _prepare_eytzinger_many(arr):
+    index = EytzingerIndex(np.asarray(arr))
+    return lambda targets: index.search_many(targets)
+
+
+def _prepare_sorted_array(arr):
+    container = SortedArray(arr)
+    return lambda targets: [container.search(t) for t in targets]
+
+
+# 名字 -> (prepare, 是否要 numpy 数组作为目标, 返回值是不是"找到的索引")
+IMPLEMENTATIONS = {
+    'binary_search': (_prepare_binary_search, False, True),
+    'lower_bound': (_prepare_lower_bound, False, False),
+    'binary_search_many': (_prepare_many_list, False, True),
+    'binary_search_many_np': (_prepare_many_numpy, True, True),
+    'eytzinger': (_prepare_eytzinger, False, True),
+    'eytzinger_many_np': (_prepare_eytzinger_many, True, True),
+    'sorted_array': (_prepare_sorted_array, False, True),
+}
+
+
+def available_implementations():
+    return [name for name, (_, needs_numpy, _) in IMPLEMENTATIONS.items()
+            if np is not None or not needs_numpy]
+
+
+def check_results(arr, targets, results, members):
+    """查得到的要返回一个值等于目标的索引（有重复时哪个都行），查不到的要返回 None / -1"""
+    for target, index in zip(targets, results):
+        index = int(index) if index is not None else None
+        if target in members:
+            if index is None or index < 0 or arr[index] != target:
+                return f'{target} 应该查得到，返回了 {index}'
+        elif index is not None and index != -1:
+            return f'{target} 应该查不到，返回了 {index}'
+    return None
+
+
+def case_key(case):
+    return f"{case['impl']}|{case['size']}|{case['distribution']}|{case['hit_ratio']:g}"
+
+
+# ============ 运行 ============
+
+def run_suite(impls=None, sizes=SIZES, distributions=DISTRIBUTIONS, hit_ratios=HIT_RATIOS,
+              lookups=LOOKUPS, repeat=REPEAT, seed=42, progress=True):
+    """跑所有组合，返回 {'meta': ..., 'results': [场景, ...]}；结果不对时抛 AssertionError"""
+    impls = impls or available_implementations()
+    rng = random.Random(seed)
+    results = []
+
+    for size in sizes:
+        for distribution in distributions:
+            arr = make_array(size, distribution, rng)
+            members = set(arr)
+            queries = {hit: make_targets(arr, hit, lookups, rng) for hit in hit_ratios}
+
+            for impl in impls:
+                prepare, needs_numpy, returns_index = IMPLEMENTATIONS[impl]
+                query = prepare(arr)
+
+                for hit_ratio, targets in queries.items():
+                    if needs_numpy:
+                        targets = np.asarray(targets)
+                    if returns_index:
+                        error = check_results(arr, targets, query(targets), members)
+                        if error:
+                            raise AssertionError(f'{impl} size={size} {distribution}: {error}')
+
+                    best = float('inf')
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        query(targets)
+                        best = min(best, time.perf_counter() - start)
+
+                    case = {
+                        'impl': impl,
+                        'size': size,
+                        'distribution': distribution,
+                        'hit_ratio': hit_ratio,
+                        'ns_per_op': best / lookups * 1e9,
+                    }
+                    results.append(case)
+                    if progress:
+                        print(f"  {case_key(case):<48} {case['ns_per_op']:>10.1f} ns", flush=True)
+
+    meta = {
+        'python': platform.python_version(),
+        'numpy': np.__version__ if np is not None else None,
+        'machine': platform.machine(),
+        'lookups': lookups,
+        'repeat': repeat,
+        'seed': seed,
+        'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    return {'meta': meta, 'results': results}
+
+
+def save_results(report, path):
+    # 先写临时文件再替换，中途出错也不会把旧基线写坏
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """
+    按场景对比两次结果，返回 (变慢的, 变快的, 对比了几个场景)
+    变慢/变快的每一项是 (场景, 基线 ns, 当前 ns, 比值)，只有变化超过 threshold 的才算
+    """
+    old = {case_key(case): case['ns_per_op'] for case in baseline['results']}
+    slower, faster = [], []
+    compared = 0
+    for case in current['results']:
+        key = case_key(case)
+        if key not in old:
+            continue
+        compared += 1
+        ratio = case['ns_per_op'] / old[key]
+        if ratio > 1 + threshold:
+            slower.append((key, old[key], case['ns_per_op'], ratio))
+        elif ratio < 1 / (1 + threshold):
+            faster.append((key, old[key], case['ns_per_op'], ratio))
+    slower.sort(key=lambda item: -item[3])
+    faster.sort(key=lambda item: item[3])
+    return slower, faster, compared
+
+
+def print_summary(report):
+    """每个实现在各个数组大小下的平均 ns/次（平均所有分布和命中率）"""
+    table = {}
+    for case in report['results']:
+        table.setdefault(case['impl'], {}).setdefault(case['size'], []).append(case['ns_per_op'])
+    sizes = sorted({case['size'] for case in report['results']})
+
+    width = 24 + 12 * len(sizes)
+    print("=" * width)
+    print(f"{'实现（平均 ns/次）':<22}" + ''.join(f"{size:>12,}" for size in sizes))
+    print("=" * width)
+    for impl, by_size in table.items():
+        cells = ''.join(f"{sum(by_size[s]) / len(by_size[s]):>12.1f}" if s in by_size else f"{'-':>12}"
+                        for s in sizes)
+        print(f"{impl:<24}{cells}")
+    print("=" * width)
+
+
+def print_comparison(slower, faster, compared, threshold, baseline):
+    meta = baseline.get('meta', {})
+    print(f"📊 和基线比较（{meta.get('time', '?')}，Python {meta.get('python', '?')}，"
+          f"numpy {meta.get('numpy')}），共 {compared} 个场景，阈值 {threshold:.0%}")
+    if compared == 0:
+        print("⚠️ 没有可以对比的场景（实现 / 大小 / 分布 / 命中率都不一样）")
+        return
+    for title, rows in (("🐢 变慢了", slower), ("🚀 变快了", faster)):
+        if not rows:
+            continue
+        print(f"{title} {len(rows)} 个：")
+        for key, old, new, ratio in rows:
+            print(f"  {key:<48} {old:>9.1f} -> {new:>9.1f} ns  {ratio:>5.2f}x")
+    if not slower:
+        print("✅ 没有超过阈值的变慢")
+
+
+def _parse_list(parser, option, text, convert=str, choices=None, check=None):
+    """把逗号分隔的参数解析成元组；格式不对、取值不合法或者有重复时直接报参数错误"""
+    items = [item.strip() for item in text.split(',') if item.strip()]
+    if not items:
+        parser.error(f'{option} 不能为空')
+    values = []
+    for item in items:
+        try:
+            value = convert(item)
+        except ValueError:
+            parser.error(f'{option} 里的 {item!r} 格式不对')
+        if choices is not None and value not in choices:
+            parser.error(f'{option} 里的 {item!r} 不认识，可选: {", ".join(choices)}')
+        if check is not None and not check(value):
+            parser.error(f'{option} 里的 {item!r} 超出范围')
+        if value in values:
+            parser.error(f'{option} 里的 {item!r} 重复了')
+        values.append(value)
+    return tuple(values)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='查找算法基准测试套件')
+    parser.add_argument('--impls', help='要测的实现，逗号分隔，默认全部：' + ','.join(IMPLEMENTATIONS))
+    parser.add_argument('--sizes', help='数组大小，逗号分隔')
+    parser.add_argument('--dists', help='数据分布，逗号分隔：' + ','.join(DISTRIBUTIONS))
+    parser.add_argument('--hits', help='命中率，逗号分隔，比如 0,0.5,1')
+    parser.add_argument('--lookups', type=int, default=LOOKUPS, help='每个场景查多少个目标')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='每个场景重复几次取最快')
+    parser.add_argument('--quick', action='store_true', help='快速模式：不测 100万，每个场景查 5000 次')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help='把这次的结果存成JSON文件')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='基线文件路径')
+    parser.add_argument('--update-baseline', action='store_true', help='把这次的结果存为新基线')
+    parser.add_argument('--compare', metavar='RESULTS', help='不跑测试，拿已保存的结果和基线比较')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help='慢了多少算回归（0.15 表示 15%%）')
+    args = parser.parse_args(argv)
+    if not args.threshold > 0:
+        parser.error('--threshold 必须大于 0')
+
+    if args.compare:
+        report = load_results(args.compare)
+    else:
+        impls = None
+        if args.impls:
+            impls = _parse_list(parser, '--impls', args.impls, choices=IMPLEMENTATIONS)
+        if impls and np is None and any(IMPLEMENTATIONS[name][1] for name in impls):
+            parser.error('没装 numpy，不能测 *_np 实现')
+
+        if args.lookups < 1 or args.repeat < 1:
+            parser.error('--lookups 和 --repeat 至少是 1')
+        if args.sizes:
+            sizes = _parse_list(parser, '--sizes', args.sizes, int, check=lambda size: size >= 1)
+        else:
+            sizes = QUICK_SIZES if args.quick else SIZES
+        distributions = DISTRIBUTIONS
+        if args.dists:
+            distributions = _parse_list(parser, '--dists', args.dists, choices=DISTRIBUTIONS)
+        hit_ratios = HIT_RATIOS
+        if args.hits:
+            hit_ratios = _parse_list(parser, '--hits', args.hits, float, check=lambda hit: 0 <= hit <= 1)
+        lookups = 5_000 if args.quick and args.lookups == LOOKUPS else args.lookups
+        report = run_suite(
+            impls=impls,
+            sizes=sizes,
+            distributions=distributions,
+            hit_ratios=hit_ratios,
+            lookups=lookups,
+            repeat=args.repeat,
+            seed=args.seed,
+        )
+        print_summary(report)
+
+    if args.output:
+        save_results(report, args.output)
+        print(f"💾 结果已保存到 {args.output}")
+
+    if args.update_baseline:
+        save_results(report, args.baseline)
+        print(f"💾 已保存为基线 {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("💡 还没有基线，用 --update-baseline 把这次的结果存为基线")
+        return 0
+
+    baseline = load_results(args.baseline)
+    slower, faster, compared = compare(report, baseline, args.threshold)
+    print_comparison(slower, faster, compared, args.threshold, baseline)
+    return 1 if slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,7 @@
+import sys
+from bisect import bisect_left, bisect_right
+
+
 def binary_search(arr, target):
     low = 0
     high = len(arr) - 1
@@ -23,13 +27,87 @@ def binary_search(arr, target):
     return None
 
 
-# 测试一下
-my_list = [1, 3, 5, 8, 9, 11, 13, 15]
-target_value = 8
+def binary_search_many(arr, targets):
+    # 一次查很多个目标，arr 必须是升序的
+    # numpy 数组：用 searchsorted 一次算完，返回索引数组，没找到的位置是 -1
+    # 普通列表：返回列表，没找到的位置是 None（和 binary_search 一样）
+    # 不在导入时 import numpy（要几十毫秒）：传进来的是 numpy 数组，numpy 肯定已经被导入过了
+    np = sys.modules.get('numpy')
+    if np is not None and (isinstance(arr, np.ndarray) or isinstance(targets, np.ndarray)):
+        arr = np.asarray(arr)
+        targets = np.asarray(targets)
+        if len(arr) == 0:
+            return np.full(targets.shape, -1, dtype=np.intp)
+
+        # 每个目标"应该插在哪"，插入位置上的元素等于目标，就是找到了
+        indices = np.searchsorted(arr, targets)
+        clipped = np.minimum(indices, len(arr) - 1)
+        found = arr[clipped] == targets
+        return np.where(found, indices, -1)
+
+    # 普通列表：每个目标用 C 实现的 bisect 查
+    n = len(arr)
+    results = []
+    for target in targets:
+        i = bisect_left(arr, target)
+        results.append(i if i < n and arr[i] == target else None)
+    return results
+
+
+# ============ bisect 家族 ============
+# 下面这些函数都要求 arr 升序；传了 key 时，arr 要按 key(元素) 升序，
+# target / lo / hi 是和 key(元素) 比较的值（和标准库 bisect 的 key 用法一样）
+# 内部都交给 C 实现的 bisect，比上面纯 Python 的循环快得多
+
+
+def lower_bound(arr, target, key=None):
+    # 第一个 >= target 的位置；都比 target 小时返回 len(arr)
+    return bisect_left(arr, target, key=key)
+
+
+def upper_bound(arr, target, key=None):
+    # 第一个 > target 的位置；有重复元素时，它和 lower_bound 之间就是所有等于 target 的元素
+    return bisect_right(arr, target, key=key)
+
+
+def equal_range(arr, target, key=None):
+    # 所有等于 target 的元素在 [start, end) 之间，没有时 start == end
+    return lower_bound(arr, target, key), upper_bound(arr, target, key)
+
+
+def count_in_range(arr, lo, hi, key=None):
+    # 统计 lo <= x <= hi 的元素个数（两边都包含）
+    if lo > hi:
+        return 0
+    return upper_bound(arr, hi, key) - lower_bound(arr, lo, key)
+
+
+def nearest(arr, target, key=None):
+    # 离 target 最近的元素的索引，一样近时取靠左的；空列表返回 None
+    if len(arr) == 0:
+        return None
+
+    i = lower_bound(arr, target, key)
+    if i == 0:
+        return 0
+    if i == len(arr):
+        return len(arr) - 1
+
+    get = key or (lambda item: item)
+    # 只可能是插入位置左右两个元素之一
+    if target - get(arr[i - 1]) <= get(arr[i]) - target:
+        return i - 1
+    return i
+
+
+if __name__ == "__main__":
+    # 测试一下
+    my_list = [1, 3, 5, 8, 9, 11, 13, 15]
+    target_value = 8
 
-result = binary_search(my_list, target_value)
+    result = binary_search(my_list, target_value)
 
-if result is not None:
-    print(f"找到了！元素 {target_value} 在索引 {result} 的位置。")
-else:
-    print("很遗憾，它不在这里。")
\ No newline at end of file
+    if result is not None:
+        print(f"找到了！元素 {target_value} 在索引 {result} 的位置。")
+    else:
+        print("很遗憾，它不在这里。")
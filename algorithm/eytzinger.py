@@ -0,0 +1,123 @@
+"""
+Eytzinger 布局的查找索引
+把有序数组按"二叉树层序（BFS）"重新排一遍：树根放在 1 号位置，
+节点 k 的左右孩子在 2k 和 2k+1。查找时从上往下走，前几层总是那几个位置，
+一直待在CPU缓存里；普通二分查找每次跳到数组的不同远处，数组一大就频繁缓存未命中。
+
+适合"建一次、查很多次"的只读场景。查找结果和 binary_search 一样：
+返回原来有序数组里的索引，找不到返回 None（numpy 批量查找时是 -1）。
+"""
+
+_np = False  # 还没尝试导入
+
+
+def _numpy():
+    # numpy 导入要几十毫秒，等第一次建索引时再导入；没装 numpy 时返回 None，用纯 Python 列表
+    global _np
+    if _np is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _np = numpy
+    return _np
+
+
+def _inorder_ranks(n, np=None):
+    # 完全二叉树（最后一层从左往右排）里，1..n 号节点各自是中序遍历的第几个
+    # 先按满二叉树算中序位置，再减去它前面缺掉的最后一层叶子数
+    height = n.bit_length() - 1
+    first_missing = 2 * (n + 1 - (1 << height))  # 第一个缺失叶子的中序位置
+
+    if np is not None:
+        k = np.arange(1, n + 1, dtype=np.int64)
+        depth = np.frexp(k.astype(np.float64))[1].astype(np.int64) - 1
+        pos = ((2 * (k - (1 << depth)) + 1) << (height - depth)) - 1
+        missing = np.where(pos > first_missing, (pos - first_missing + 1) // 2, 0)
+        return pos - missing
+
+    ranks = []
+    for k in range(1, n + 1):
+        depth = k.bit_length() - 1
+        pos = ((2 * (k - (1 << depth)) + 1) << (height - depth)) - 1
+        missing = (pos - first_missing + 1) // 2 if pos > first_missing else 0
+        ranks.append(pos - missing)
+    return ranks
+
+
+class EytzingerIndex:
+    """
+    只读的有序查找索引
+
+    sorted_values: 升序的列表或 numpy 数组，建索引时复制一份，之后原数组可以随便改
+    """
+
+    def __init__(self, sorted_values):
+        self.size = n = len(sorted_values)
+        self._np = np = _numpy()
+        ranks = _inorder_ranks(n, np) if n else []
+
+        if np is not None:
+            values = np.asarray(sorted_values)
+            ranks = np.asarray(ranks, dtype=np.intp)
+            # 0 号位置不用，放什么都行
+            self._tree = np.empty(n + 1, dtype=values.dtype)
+            self._tree[1:] = values[ranks]
+            self._ranks = np.concatenate(([-1], ranks))
+        else:
+            self._tree = [None] + [sorted_values[r] for r in ranks]
+            self._ranks = [-1] + list(ranks)
+        self._scalar_tree = None
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, target):
+        return self.search(target) is not None
+
+    def _lower_bound_slot(self, target):
+        # 单个查找逐个下标访问，numpy 标量太慢，第一次用时转成 Python 列表
+        if self._scalar_tree is None:
+            self._scalar_tree = self._tree.tolist() if self._np is not None else self._tree
+
+        # 从根往下走：比 target 小往右，否则往左
+        tree, n = self._scalar_tree, self.size
+        k = 1
+        while k <= n:
+            k = 2 * k + (tree[k] < target)
+        # 去掉最后连续的"往右"，剩下的就是第一个 >= target 的节点（0 表示没有）
+        return k >> (~k & (k + 1)).bit_length()
+
+    def search(self, target):
+        # 和 binary_search 一样：找到返回原有序数组里的索引，找不到返回 None
+        k = self._lower_bound_slot(target)
+        if k and self._scalar_tree[k] == target:
+            return int(self._ranks[k])
+        return None
+
+    def search_many(self, targets):
+        # 批量查找：有 numpy 时所有目标一起一层一层往下走，返回索引数组（没找到是 -1）
+        np = self._np
+        if np is None:
+            return [self.search(target) for target in targets]
+
+        targets = np.asarray(targets)
+        n = self.size
+        if n == 0:
+            return np.full(targets.shape, -1, dtype=np.intp)
+
+        tree = self._tree
+        k = np.ones(targets.shape, dtype=np.int64)
+        for _ in range(n.bit_length()):
+            active = k <= n
+            if not active.any():
+                break
+            node = tree[np.minimum(k, n)]
+            k = np.where(active, 2 * k + (node < targets), k)
+
+        # 最低位的 0 在第几位，就右移几+1位
+        lowest_zero = ~k & (k + 1)
+        k >>= np.frexp(lowest_zero.astype(np.float64))[1].astype(np.int64)
+
+        found = (k > 0) & (tree[k] == targets)
+        return np.where(found, self._ranks[k], -1)
@@ -0,0 +1,225 @@
+"""
+支持增量插入的有序容器
+把数据分成很多个小的有序列表（每块大约 load 个元素），再记下每块的最大值：
+查找时先在"每块最大值"里二分找到块，再在块内二分，都是 O(log n)；
+插入/删除只挪动一个小块里的元素，不用像 list.insert 那样挪动整个数组。
+每块的长度另外放在一棵树状数组（Fenwick 树）里，"某块前面一共有多少个元素"
+和"第 i 个元素在哪一块"都是 O(log 块数)，插入/删除后只改树上 O(log 块数) 个位置。
+
+查找语义和 binary_search 一样：找到返回（全局）索引，找不到返回 None。
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import chain
+
+DEFAULT_LOAD = 1000
+
+
+class SortedArray:
+    """
+    分块有序数组
+
+    iterable: 初始数据，不要求有序（内部会排序后一次性分块）
+    load: 每块的目标大小，块超过 2*load 时拆成两块，少于 load/2 时和旁边的块合并
+    """
+
+    def __init__(self, iterable=(), load=DEFAULT_LOAD):
+        self._load = load
+        self._lists = []     # 每一块都是有序列表
+        self._maxes = []     # 每一块的最大值
+        self._index = None   # 每块长度的树状数组（下标从 1 开始），用到时才建
+        self._len = 0
+        self.update(iterable)
+
+    # ============ 修改 ============
+
+    def update(self, iterable):
+        """批量加入：整体排序后重新分块，比一个一个 add 快得多"""
+        values = list(iterable)
+        if not values:
+            return
+        if self._lists:
+            values.extend(chain.from_iterable(self._lists))
+        values.sort()
+
+        load = self._load
+        self._lists = [values[i:i + load] for i in range(0, len(values), load)]
+        self._maxes = [chunk[-1] for chunk in self._lists]
+        self._len = len(values)
+        self._index = None
+
+    def add(self, value):
+        """插入一个元素"""
+        lists, maxes = self._lists, self._maxes
+        if not maxes:
+            lists.append([value])
+            maxes.append(value)
+            self._index = None
+        else:
+            pos = bisect_right(maxes, value)
+            if pos == len(maxes):
+                # 比所有元素都大，直接放到最后一块末尾
+                pos -= 1
+                lists[pos].append(value)
+                maxes[pos] = value
+            else:
+                insort(lists[pos], value)
+            if not self._split(pos):
+                self._index_add(pos, 1)
+
+        self._len += 1
+
+    def remove(self, value):
+        """删除一个等于 value 的元素，不存在时抛 ValueError（和 list.remove 一样）"""
+        if not self.discard(value):
+            raise ValueError(f'{value!r} 不在 SortedArray 里')
+
+    def discard(self, value):
+        """删除一个等于 value 的元素，返回是否删掉了"""
+        lists, maxes = self._lists, self._maxes
+        pos = bisect_left(maxes, value)
+        if pos == len(maxes):
+            return False
+
+        chunk = lists[pos]
+        i = bisect_left(chunk, value)
+        if chunk[i] != value:
+            return False
+
+        del chunk[i]
+        self._len -= 1
+        if chunk:
+            maxes[pos] = chunk[-1]
+            if not self._merge(pos):
+                self._index_add(pos, -1)
+        else:
+            del lists[pos]
+            del maxes[pos]
+            self._index = None
+        return True
+
+    def _split(self, pos):
+        # 块太大时拆成两半，返回是否拆了（块数变了，树状数组要重建）
+        chunk = self._lists[pos]
+        if len(chunk) <= 2 * self._load:
+            return False
+        half = chunk[self._load:]
+        del chunk[self._load:]
+        self._lists.insert(pos + 1, half)
+        self._maxes[pos] = chunk[-1]
+        self._maxes.insert(pos + 1, half[-1])
+        self._index = None
+        return True
+
+    def _merge(self, pos):
+        # 块太小时并到前一块（第一块就并后一块），合并后太大再拆开；返回是否合并了
+        lists = self._lists
+        if len(lists[pos]) >= self._load // 2 or len(lists) == 1:
+            return False
+        if pos == 0:
+            pos = 1
+        lists[pos - 1].extend(lists[pos])
+        del lists[pos]
+        del self._maxes[pos - 1]
+        self._split(pos - 1)
+        self._index = None
+        return True
+
+    # ============ 每块长度的树状数组 ============
+    # 拆块/合并块时块数变了，直接丢掉，下次用到时 O(块数) 重建；
+    # 拆合每隔大约 load 次插入/删除才发生一次，平摊下来很便宜
+
+    def _build_index(self):
+        tree = [0]
+        tree.extend(map(len, self._lists))
+        n = len(tree) - 1
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._index = tree
+        return tree
+
+    def _index_add(self, pos, delta):
+        # 第 pos 块（从 0 开始）的长度变了 delta；树还没建就不用管
+        tree = self._index
+        if tree is None:
+            return
+        i, n = pos + 1, len(tree) - 1
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def _offset(self, pos):
+        """第 pos 块第一个元素的全局索引（前面所有块的长度之和）"""
+        tree = self._index or self._build_index()
+        total = 0
+        while pos:
+            total += tree[pos]
+            pos &= pos - 1
+        return total
+
+    def _locate(self, index):
+        """全局索引 -> (块号, 块内索引)"""
+        tree = self._index or self._build_index()
+        n = len(tree) - 1
+        pos = 0
+        step = 1 << (n.bit_length() - 1)
+        while step:
+            nxt = pos + step
+            if nxt <= n and tree[nxt] <= index:
+                pos = nxt
+                index -= tree[nxt]
+            step >>= 1
+        return pos, index
+
+    # ============ 查找 ============
+
+    def lower_bound(self, value):
+        """第一个 >= value 的全局索引，都比 value 小时返回 len(self)"""
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._offset(pos) + bisect_left(self._lists[pos], value)
+
+    def upper_bound(self, value):
+        """第一个 > value 的全局索引"""
+        pos = bisect_right(self._maxes, value)
+        if pos == len(self._maxes):
+            return self._len
+        return self._offset(pos) + bisect_right(self._lists[pos], value)
+
+    def search(self, target):
+        """和 binary_search 一样：找到返回索引（有重复时是第一个），找不到返回 None"""
+        pos = bisect_left(self._maxes, target)
+        if pos == len(self._maxes):
+            return None
+        chunk = self._lists[pos]
+        i = bisect_left(chunk, target)
+        if chunk[i] != target:
+            return None
+        return self._offset(pos) + i
+
+    def __contains__(self, value):
+        pos = bisect_left(self._maxes, value)
+        if pos == len(self._maxes):
+            return False
+        chunk = self._lists[pos]
+        return chunk[bisect_left(chunk, value)] == value
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('SortedArray 索引越界')
+        pos, i = self._locate(index)
+        return self._lists[pos][i]
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self._lists)
+
+    def __repr__(self):
+        return f'SortedArray({list(self)!r})'
@@ -4,9 +4,15 @@ API学习 - 第一课：理解API的基本概念
 目标: 通过实际代码理解什么是API和API Key
 """
 
+import asyncio
+
 import requests
 import json
 
+from async_fetch import fetch_many
+from cassette import install_from_env
+from json_backend import Post, response_json
+
 
 def test_free_api():
     """
@@ -46,13 +52,12 @@ def test_multiple_requests():
     print("练习2：批量获取数据")
     print("=" * 60)
 
-    # 获取前5篇文章
-    for i in range(1, 6):
-        url = f"https://jsonplaceholder.typicode.com/posts/{i}"
-        response = requests.get(url)
+    # 获取前5篇文章（5个请求同时发出，结果按顺序返回）
+    urls = [f"https://jsonplaceholder.typicode.com/posts/{i}" for i in range(1, 6)]
+    results = asyncio.run(fetch_many(urls, concurrency=5))
 
-        if response.status_code == 200:
-            data = response.json()
+    for i, data in enumerate(results, 1):
+        if data:
             print(f"{i}. {data['title'][:40]}...")
 
 
@@ -74,11 +79,11 @@ def test_api_with_parameters():
     response = requests.get(url, params=params)
 
     if response.status_code == 200:
-        data = response.json()
+        data = response_json(response, Post, many=True)
         print(f"✓ 找到 {len(data)} 篇文章")
         print(f"前3篇标题:")
         for i, post in enumerate(data[:3], 1):
-            print(f"  {i}. {post['title']}")
+            print(f"  {i}. {post.title}")
 
 
 def test_weather_api():
@@ -135,6 +140,8 @@ def test_weather_api():
 
 
 if __name__ == "__main__":
+    install_from_env()  # 设置了 API_CASSETTE 环境变量时离线录制 / 回放
+
     print("\n🚀 开始API学习之旅！\n")
 
     # 练习1: 基础GET请求
@@ -4,6 +4,8 @@ API学习 - 使用HTTP协议（避免SSL问题）
 
 import requests
 
+from cassette import install_from_env
+
 
 def test_http_api():
     """
@@ -54,6 +56,8 @@ def test_joke_api():
 
 
 if __name__ == "__main__":
+    install_from_env()  # 设置了 API_CASSETTE 环境变量时离线录制 / 回放
+
     print("\n🚀 开始API学习！\n")
 
     test_http_api()
@@ -4,11 +4,35 @@ API学习 - 稳定版本
 日期: 2025-02-08
 """
 
-import requests
-import urllib3
+import threading
 
-# 禁用SSL警告（学习阶段临时使用）
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from paginator import PageNumber, paginate
+
+# 所有练习共用一个客户端，同一个网站的请求会复用连接，临时失败会自动重试
+# 第一次用到时才创建（导入这个模块时不导入 requests）
+client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global client
+    if client is None:
+        # 加锁再检查一次：多个线程同时第一次调用时也只创建一个客户端
+        with _client_lock:
+            if client is None:
+                client = _build_client()
+    return client
+
+
+def _build_client():
+    import urllib3
+
+    from api_client import APIClient
+    from retry_policy import RetryPolicy
+
+    # 禁用SSL警告（学习阶段临时使用）
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    return APIClient(timeout=10, verify=False, retry=RetryPolicy(max_attempts=3, deadline=30))
 
 
 def test_joke_api():
@@ -22,7 +46,7 @@ def test_joke_api():
     url = "https://official-joke-api.appspot.com/random_joke"
 
     try:
-        response = requests.get(url, timeout=10, verify=False)
+        response = get_client().get(url)
 
         if response.status_code == 200:
             data = response.json()
@@ -47,7 +71,7 @@ def test_random_user_api():
     url = "https://randomuser.me/api/"
 
     try:
-        response = requests.get(url, timeout=10, verify=False)
+        response = get_client().get(url)
 
         if response.status_code == 200:
             data = response.json()
@@ -77,7 +101,7 @@ def test_cat_fact_api():
     url = "https://catfact.ninja/fact"
 
     try:
-        response = requests.get(url, timeout=10, verify=False)
+        response = get_client().get(url)
 
         if response.status_code == 200:
             data = response.json()
@@ -103,7 +127,7 @@ def test_api_with_parameters():
     url = "https://official-joke-api.appspot.com/jokes/programming/random"
 
     try:
-        response = requests.get(url, timeout=10, verify=False)
+        response = get_client().get(url)
 
         if response.status_code == 200:
             jokes = response.json()
@@ -129,7 +153,7 @@ def test_ip_api():
     url = "https://ipapi.co/json/"
 
     try:
-        response = requests.get(url, timeout=10, verify=False)
+        response = get_client().get(url)
 
         if response.status_code == 200:
             data = response.json()
@@ -157,7 +181,7 @@ def analyze_api_response():
     url = "https://official-joke-api.appspot.com/random_joke"
 
     try:
-        response = requests.get(url, timeout=10, verify=False)
+        response = get_client().get(url)
 
         print(f"\n📊 响应分析:")
         print(f"  状态码: {response.status_code}")
@@ -174,7 +198,36 @@ def analyze_api_response():
         print(f"✗ 请求失败: {e}")
 
 
+def test_pagination():
+    """
+    练习7：分页获取数据
+    """
+    print("\n" + "=" * 60)
+    print("练习7：一页页获取全部文章")
+    print("=" * 60)
+
+    # jsonplaceholder 用 _page / _limit 分页，一共100篇文章
+    url = "https://jsonplaceholder.typicode.com/posts"
+    style = PageNumber(page_param='_page', size_param='_limit', page_size=20)
+
+    try:
+        titles_by_user = {}
+        for post in paginate(get_client(), url, style):  # 处理当前页时，下一页已经在后台请求了
+            titles_by_user.setdefault(post['userId'], []).append(post['title'])
+
+        total = sum(len(titles) for titles in titles_by_user.values())
+        print(f"✓ 共获取 {total} 篇文章（每页 {style.page_size} 篇）")
+        for user_id, titles in list(titles_by_user.items())[:3]:
+            print(f"  用户{user_id}: {len(titles)} 篇，第一篇《{titles[0]}》")
+    except Exception as e:
+        print(f"✗ 请求失败: {e}")
+
+
 if __name__ == "__main__":
+    from cassette import install_from_env
+
+    install_from_env()  # 设置了 API_CASSETTE 环境变量时离线录制 / 回放
+
     print("\n" + "🚀" * 30)
     print("开始API学习之旅！")
     print("🚀" * 30 + "\n")
@@ -186,6 +239,7 @@ if __name__ == "__main__":
     test_api_with_parameters()
     test_ip_api()
     analyze_api_response()
+    test_pagination()
 
     # 总结
     print("\n" + "=" * 60)
@@ -199,10 +253,12 @@ if __name__ == "__main__":
 5. ✅ 需要用 try-except 处理网络异常
 6. ✅ 可以传递 params 参数来筛选数据
 7. ✅ API响应包含状态码、头信息、内容等多种信息
+8. ✅ 用 requests.Session 复用连接，多次请求同一个网站更快
+9. ✅ 分页接口用生成器一页页取，处理当前页时预取下一页
 
 💡 下一步学习计划:
    - 学习POST请求（不只是GET）
    - 学习需要API Key的认证方式
-   - 学习处理分页、限流等问题
+   - 学习处理限流等问题
     """)
     print("=" * 60)
\ No newline at end of file
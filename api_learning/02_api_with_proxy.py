@@ -3,11 +3,11 @@ API学习 - 完美配置版（支持V2RayN代理）
 日期: 2025-02-08
 """
 
-import requests
-import urllib3
+import os
+import threading
 
-# 禁用SSL警告
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from event_log import RULE, log
+from json_backend import GitHubUser, Joke, response_json
 
 # ============ V2RayN 代理配置 ============
 USE_PROXY = True  # 改成False可以关闭代理
@@ -17,43 +17,134 @@ if USE_PROXY:
         'http': 'http://127.0.0.1:10808',
         'https': 'http://127.0.0.1:10808',
     }
-    print("🔧 使用代理: V2RayN (HTTP 10808端口)\n")
 else:
     proxies = None
-    print("🔧 直连模式（不使用代理）\n")
+
+# 会重复查询、结果短时间内不变的接口才缓存（秒）；随机类接口不缓存
+CACHE_TTL = {
+    'https://ipapi.co/': 600,
+    'https://api.github.com/': 600,
+    'https://api.coinbase.com/': 30,
+}
+
+# 限流（每秒请求数, 最多连续突发几个）：GitHub 匿名每小时只有60次，
+# 其他接口默认每秒5个；服务器返回 X-RateLimit-* 头时会自动调整
+RATE_LIMITS = {
+    'api.github.com': (60 / 3600, 10),
+}
+
+# 磁盘缓存：重启后同一个URL带 ETag 去问服务器，没变就回 304，不用重新下载
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.http_cache.sqlite3')
+
+# 每个请求分阶段计时，程序结束时打印汇总，并写成 Prometheus 文本格式
+METRICS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.metrics.prom')
+
+# 所有请求共用一个客户端，第一次调用 get_client() 时才创建：
+# 导入这个模块时不导入 requests、不打开磁盘缓存、也不打印任何东西
+client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global client
+    if client is None:
+        # 多个线程同时第一次调用时只创建一个客户端，否则各自一套连接池和 SingleFlight，合并不了请求
+        with _client_lock:
+            if client is None:
+                client = _build_client()
+    return client
+
+
+def _build_client():
+    import urllib3
+
+    from api_client import APIClient
+    from disk_cache import DiskCache
+    from metrics import RequestMetrics
+    from proxy_pool import V2RAY_CONFIGS, ProxyPool
+    from rate_limiter import HostRateLimiter
+    from response_cache import ResponseCache
+    from retry_policy import RetryPolicy
+    from single_flight import SingleFlight
+
+    # 禁用SSL警告
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    if proxies:
+        # 10808 优先，V2RayN 的其他可能配置当备用；哪个快、哪个稳定就用哪个，
+        # 连续失败的代理会被熔断一段时间
+        proxy_pool = ProxyPool(
+            [{'name': 'HTTP - 端口10808', 'proxies': proxies}]
+            + [config for config in V2RAY_CONFIGS if config['proxies'] != proxies]
+        )
+        log.info('proxy.mode', "🔧 使用代理: V2RayN (HTTP 10808端口，另有 {backups} 个备用)\n",
+                 mode='proxy', backups=len(proxy_pool.endpoints) - 1)
+    else:
+        proxy_pool = None
+        log.info('proxy.mode', "🔧 直连模式（不使用代理）\n", mode='direct')
+
+    # 复用连接（和代理隧道），并缓存重复请求
+    return APIClient(
+        proxies=proxies,
+        verify=False,  # 和原来一样不校验证书（上面已经禁用了SSL警告）
+        proxy_pool=proxy_pool,
+        cache=ResponseCache(default_ttl=0, ttl_rules=CACHE_TTL),
+        disk_cache=DiskCache(CACHE_PATH),
+        # 代理偶尔断一下或者服务器临时过载时自动重试，整体最多等30秒
+        retry=RetryPolicy(max_attempts=3, backoff=0.5, deadline=30),
+        rate_limiter=HostRateLimiter(default_rate=5, default_burst=10, rules=RATE_LIMITS),
+        # 多个线程同时请求同一个URL时只发一次，不重复占用连接和限流额度
+        single_flight=SingleFlight(),
+        metrics=RequestMetrics(),
+    )
 
 
 # =========================================
 
 
-def api_request(url, description):
+def _format_timings(fields):
+    return "   " + " | ".join(f"{phase} {seconds * 1000:.0f}ms"
+                            for phase, seconds in fields['timings'].items())
+
+
+def api_request(url, description, schema=None, many=False):
     """
     通用API请求函数
-    自动处理代理和异常
+    自动处理代理和异常；给了 schema 时把JSON直接解码成对应的数据类（many=True 表示列表）
+    输出走 event_log（API_LOG_LEVEL=quiet 时不输出，API_LOG_FORMAT=json 时一行一个事件）
     """
-    print("=" * 60)
-    print(f"请求: {description}")
-    print("=" * 60)
-    print(f"🌐 URL: {url}")
+    log.info('request.start', RULE + "\n请求: {description}\n" + RULE + "\n🌐 URL: {url}",
+             description=description, url=url)
 
     try:
-        response = requests.get(
-            url,
-            proxies=proxies,
-            verify=False,
-            timeout=10
-        )
+        response = get_client().get(url)
 
         if response.status_code == 200:
-            print(f"✓ 成功！状态码: {response.status_code}")
-            print(f"⏱️  响应时间: {response.elapsed.total_seconds():.2f}秒")
-            return response.json()
+            if getattr(response, 'from_cache', False):
+                log.info('request.ok', "✓ 成功！状态码: {status}\n⚡ 来自缓存（没有发网络请求）",
+                         url=url, status=response.status_code, source='cache')
+            elif getattr(response, 'revalidated', False):
+                log.info('request.ok', "✓ 成功！状态码: {status}\n"
+                         "♻️  304 未修改，用本地缓存的正文（{elapsed:.2f}秒）",
+                         url=url, status=response.status_code, source='revalidated',
+                         elapsed=response.elapsed.total_seconds())
+            else:
+                log.info('request.ok', "✓ 成功！状态码: {status}\n⏱️  响应时间: {elapsed:.2f}秒",
+                         url=url, status=response.status_code, source='network',
+                         elapsed=response.elapsed.total_seconds())
+                timings = getattr(response, 'timings', None)
+                if timings:
+                    log.info('request.timings', _format_timings, url=url, timings=timings)
+            if getattr(response, 'proxy_name', None):
+                log.info('request.proxy', "🔀 代理: {proxy}", url=url, proxy=response.proxy_name)
+            return response_json(response, schema, many)
         else:
-            print(f"✗ 失败，状态码: {response.status_code}")
+            log.warning('request.failed', "✗ 失败，状态码: {status}",
+                        url=url, status=response.status_code)
             return None
 
     except Exception as e:
-        print(f"✗ 请求失败: {type(e).__name__}")
+        log.error('request.error', "✗ 请求失败: {error}", url=url, error=type(e).__name__)
         return None
 
 
@@ -61,14 +152,15 @@ def test_joke_api():
     """练习1：获取编程笑话"""
     data = api_request(
         "https://official-joke-api.appspot.com/jokes/programming/random",
-        "编程笑话API"
+        "编程笑话API",
+        schema=Joke, many=True,
     )
 
     if data:
         print(f"\n😄 笑话:")
         for joke in data[:2]:  # 显示2个
-            print(f"   Q: {joke['setup']}")
-            print(f"   A: {joke['punchline']}\n")
+            print(f"   Q: {joke.setup}")
+            print(f"   A: {joke.punchline}\n")
 
 
 def test_random_user_api():
@@ -123,15 +215,16 @@ def test_github_api():
 
     data = api_request(
         f"https://api.github.com/users/{username}",
-        f"GitHub API - 查询用户 {username}"
+        f"GitHub API - 查询用户 {username}",
+        schema=GitHubUser,
     )
 
     if data:
-        print(f"\n💻 GitHub用户: {data['login']}")
-        print(f"   姓名: {data.get('name', 'N/A')}")
-        print(f"   粉丝: {data['followers']}")
-        print(f"   仓库数: {data['public_repos']}")
-        bio = data.get('bio') or '无简介'
+        print(f"\n💻 GitHub用户: {data.login}")
+        print(f"   姓名: {data.name or 'N/A'}")
+        print(f"   粉丝: {data.followers}")
+        print(f"   仓库数: {data.public_repos}")
+        bio = data.bio or '无简介'
         print(f"   简介: {bio}\n")
 
 
@@ -150,6 +243,11 @@ def test_crypto_price_api():
 
 
 if __name__ == "__main__":
+    from cassette import install_from_env
+
+    install_from_env()  # 设置了 API_CASSETTE 环境变量时离线录制 / 回放
+    metrics = get_client().metrics  # 创建客户端，打印代理配置
+
     print("\n" + "🚀" * 30)
     print("API实战练习 - V2RayN配置版")
     print("🚀" * 30 + "\n")
@@ -162,6 +260,14 @@ if __name__ == "__main__":
     test_github_api()
     test_crypto_price_api()
 
+    # 各阶段耗时汇总
+    print("\n" + "=" * 60)
+    print("⏱️  请求耗时汇总（按主机、阶段）")
+    print("=" * 60)
+    metrics.print_summary()
+    metrics.write_prometheus(METRICS_PATH)
+    print(f"📈 Prometheus 格式已写入 {METRICS_PATH}")
+
     # 总结
     print("\n" + "=" * 60)
     print("🎉 代理问题解决！")
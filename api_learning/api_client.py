@@ -0,0 +1,201 @@
+"""
+可复用的API客户端
+用一个 requests.Session 管理连接池、keep-alive 和代理配置，
+同一个主机的多次请求复用已经建好的 TCP/TLS 连接（走代理时还能复用 CONNECT 隧道），
+不用每次都重新做 DNS、握手
+"""
+
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import json_backend
+from json_stream import iter_json_array
+from metrics import TimingAdapter
+from response_cache import cache_key
+
+DEFAULT_TIMEOUT = 10
+
+
+def _flight_key(url, kwargs):
+    """
+    single-flight 的键：URL 和参数，再加上这次调用单独传的请求头
+    （Authorization 等请求头不同的请求可能返回不同的内容，不能共用一个响应）
+    """
+    key = cache_key(url, kwargs.get('params'))
+    headers = kwargs.get('headers')
+    if headers:
+        key = (key, tuple(sorted((str(name).lower(), str(value)) for name, value in headers.items())))
+    return key
+
+
+def _per_caller(kwargs):
+    """
+    这次调用单独带了请求头 / auth / cookies：响应可能只属于这个调用方
+    （比如不同的 Authorization），不能放进按URL共用的缓存
+    """
+    return bool(kwargs.get('headers')) or kwargs.get('auth') is not None \
+        or kwargs.get('cookies') is not None
+
+
+class APIClient:
+    """
+    带连接池的API客户端
+
+    verify: 是否校验 HTTPS 证书，默认校验；只有确实需要（比如走会替换证书的代理）时才传 False
+    pool_connections: 缓存多少个主机的连接池
+    pool_maxsize: 每个主机最多保留多少条空闲连接（并发请求时要调大）
+    cache: 可选的 ResponseCache，命中时直接返回缓存的响应（单独带了 headers / auth / cookies 的请求不走缓存）
+    disk_cache: 可选的 DiskCache，带条件请求头去问服务器，304 时用本地存的正文
+    retry: 可选的 RetryPolicy，失败时按策略自动重试
+    rate_limiter: 可选的 HostRateLimiter，每次发请求前先拿令牌，并根据响应头调整速度
+    proxy_pool: 可选的 ProxyPool，每次请求从池子里挑最健康的代理（优先于 proxies）
+    single_flight: 可选的 SingleFlight，同一个URL（和参数）的并发请求只发一次，大家共用结果
+    metrics: 可选的 RequestMetrics，记录每个请求各阶段（DNS/连接/TLS/首字节/下载）的耗时
+    """
+
+    def __init__(self, proxies=None, timeout=DEFAULT_TIMEOUT, verify=True,
+                 pool_connections=10, pool_maxsize=10, headers=None, cache=None,
+                 disk_cache=None, retry=None, rate_limiter=None, proxy_pool=None,
+                 single_flight=None, metrics=None):
+        self.proxies = proxies
+        self.timeout = timeout
+        self.verify = verify
+        self.cache = cache
+        self.disk_cache = disk_cache
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.proxy_pool = proxy_pool
+        self.single_flight = single_flight
+        self.metrics = metrics
+
+        self.session = requests.Session()
+        if metrics is not None:
+            adapter = TimingAdapter(metrics, pool_connections=pool_connections,
+                                    pool_maxsize=pool_maxsize)
+        else:
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+            )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers['Connection'] = 'keep-alive'
+        if headers:
+            self.session.headers.update(headers)
+
+    def get(self, url, **kwargs):
+        """发送GET请求，返回 requests.Response"""
+        if (self.single_flight is not None and not kwargs.get('stream')
+                and kwargs.get('auth') is None and kwargs.get('cookies') is None):
+            # 合并后所有调用方拿到的是同一个 Response 对象；
+            # 单独传了 auth / cookies 的请求不合并，免得不同身份的调用方拿到别人的响应
+            return self.single_flight.do(_flight_key(url, kwargs), self._get, url, **kwargs)
+        return self._get(url, **kwargs)
+
+    def _get(self, url, **kwargs):
+        if self.cache is not None and not kwargs.get('stream') and not _per_caller(kwargs):
+            key = cache_key(url, kwargs.get('params'))
+            if self.cache.ttl_for(key) > 0:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return cached
+                response = self._send(url, **kwargs)
+                self.cache.put(key, response)
+                return response
+
+        return self._send(url, **kwargs)
+
+    def _send(self, url, **kwargs):
+        kwargs.setdefault('proxies', self.proxies)
+        kwargs.setdefault('verify', self.verify)
+        kwargs.setdefault('timeout', self.timeout)
+
+        if self.disk_cache is None or kwargs.get('stream') or _per_caller(kwargs):
+            return self._fetch(url, **kwargs)
+
+        key = cache_key(url, kwargs.get('params'))
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.update(self.disk_cache.conditional_headers(key))
+        response = self._fetch(url, headers=headers, **kwargs)
+
+        if response.status_code == 304:
+            revalidated = self.disk_cache.revalidate(key, response)
+            if revalidated is not None:
+                return revalidated
+        self.disk_cache.store(key, response)
+        return response
+
+    def _fetch(self, url, **kwargs):
+        # 真正发网络请求的地方，有重试策略时交给它决定要不要重试
+        timeout = kwargs.pop('timeout')
+
+        def send(attempt_timeout):
+            # 每一次尝试（包括重试）都要先拿令牌
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+            if self.proxy_pool is not None:
+                response = self._get_via_pool(url, timeout=attempt_timeout, **kwargs)
+            else:
+                response = self.session.get(url, timeout=attempt_timeout, **kwargs)
+            if self.rate_limiter is not None:
+                self.rate_limiter.update_from_response(url, response)
+            return response
+
+        if self.retry is None:
+            return send(timeout)
+        return self.retry.call(send, timeout)
+
+    def _get_via_pool(self, url, **kwargs):
+        # 从代理池挑一个代理发请求，并把结果（延迟/失败）记回池子
+        endpoint = self.proxy_pool.choose()
+        if endpoint is None:
+            raise requests.exceptions.ProxyError('代理池里所有代理都处于熔断状态')
+
+        kwargs['proxies'] = endpoint.proxies
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            self.proxy_pool.record_failure(endpoint)
+            raise
+        except requests.RequestException as e:
+            # 比如没装 SOCKS 支持：也算这个代理失败，转成 ProxyError 让重试换一个代理
+            self.proxy_pool.record_failure(endpoint)
+            raise requests.exceptions.ProxyError(f'代理 {endpoint.name} 不可用: {e}') from e
+        finally:
+            # 其他异常（比如参数错误）不算代理的成败，但试探名额要还回去
+            self.proxy_pool.release(endpoint)
+        self.proxy_pool.record_success(endpoint, time.perf_counter() - start)
+        response.proxy_name = endpoint.name
+        return response
+
+    def get_json(self, url, **kwargs):
+        """发送GET请求，状态码200时返回解析好的JSON，否则返回 None"""
+        response = self.get(url, **kwargs)
+        if response.status_code == 200:
+            return json_backend.loads(response.content)
+        return None
+
+    def stream_items(self, url, chunk_size=64 * 1024, **kwargs):
+        """
+        流式请求一个返回JSON数组的接口，边下载边逐个 yield 数组元素
+        不用等整个响应下载完，也不会把整个列表放进内存；状态码不是200时抛 HTTPError
+        """
+        response = self.get(url, stream=True, **kwargs)
+        try:
+            response.raise_for_status()
+            yield from iter_json_array(response.iter_content(chunk_size))
+        finally:
+            response.close()
+
+    def close(self):
+        """关闭连接池里的所有连接"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,61 @@
+"""
+异步批量请求
+asyncio 负责控制同时在途的请求数量，真正的HTTP请求交给 APIClient 的连接池
+（在线程池里执行），所以代理字典、连接复用、超时都和同步版本完全一样
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from api_client import APIClient
+
+
+async def _fetch_one(loop, executor, client, semaphore, index, url):
+    """请求一个URL，失败时返回 None（和 api_request 一样）"""
+    async with semaphore:
+        try:
+            data = await loop.run_in_executor(executor, client.get_json, url)
+        except Exception:
+            data = None
+    return index, url, data
+
+
+async def fetch_as_completed(urls, concurrency=10, proxies=None, client=None):
+    """
+    异步生成器：同时最多 concurrency 个请求，哪个先完成就先 yield (序号, url, 数据)
+
+    client 不传时会新建一个连接池大小等于 concurrency 的 APIClient，用完自动关闭
+    """
+    urls = list(urls)
+    if not urls:
+        return
+
+    own_client = client is None
+    if own_client:
+        client = APIClient(proxies=proxies, pool_maxsize=concurrency)
+
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    tasks = [
+        asyncio.ensure_future(_fetch_one(loop, executor, client, semaphore, index, url))
+        for index, url in enumerate(urls)
+    ]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        if own_client:
+            client.close()
+
+
+async def fetch_many(urls, concurrency=10, proxies=None, client=None):
+    """批量请求，结果顺序和 urls 一致，失败的位置是 None"""
+    urls = list(urls)
+    results = [None] * len(urls)
+    async for index, _, data in fetch_as_completed(urls, concurrency, proxies, client):
+        results[index] = data
+    return results
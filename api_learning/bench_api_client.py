@@ -0,0 +1,55 @@
+"""
+连接池性能测试
+对比每次都 requests.get（新连接）和 APIClient（复用连接）的单次请求延迟
+用 handshake_delay 模拟 TLS / 代理隧道这类"每条新连接都要付一次"的开销
+"""
+
+import statistics
+import time
+
+import requests
+
+from api_client import APIClient
+from local_server import LocalServer
+
+REQUESTS = 200
+
+
+def measure(fetch, url, count=REQUESTS):
+    """返回每次请求的耗时列表（毫秒）"""
+    timings = []
+    for i in range(count):
+        start = time.perf_counter()
+        response = fetch(f'{url}/posts/{i}')
+        response.content
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def run_case(handshake_delay):
+    with LocalServer(handshake_delay=handshake_delay) as server:
+        cold = measure(lambda url: requests.get(url, timeout=10), server.url)
+        cold_connections = server.connection_count
+
+        with APIClient() as client:
+            client.get(server.url)  # 预热：先建立好连接
+            warm = measure(client.get, server.url)
+        warm_connections = server.connection_count - cold_connections
+
+    cold_avg = statistics.mean(cold)
+    warm_avg = statistics.mean(warm)
+    print(f"{handshake_delay * 1000:>8.0f}ms {cold_avg:>10.2f}ms {warm_avg:>10.2f}ms"
+          f" {cold_avg / warm_avg:>7.1f}x {cold_connections:>6}/{warm_connections:<4}")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print(f"每种方式各请求 {REQUESTS} 次")
+    print(f"{'握手延迟':>8} {'requests.get':>12} {'APIClient':>12} {'加速':>8} {'新建连接数':>10}")
+    print("=" * 60)
+
+    for delay in (0, 0.005, 0.02):
+        run_case(delay)
+
+    print("=" * 60)
+    print("💡 requests.get 每次都新建连接；APIClient 只在第一次建立连接，之后全部复用")
@@ -0,0 +1,56 @@
+"""
+批量请求吞吐量测试
+对比串行 for 循环（test_multiple_requests 的写法）和 fetch_many 在不同并发数下的 请求数/秒
+本地服务器每个请求固定等待 10ms，模拟真实API的服务端耗时
+"""
+
+import asyncio
+import time
+
+import requests
+
+from async_fetch import fetch_many
+from local_server import LocalServer
+
+TOTAL = 500
+SERVER_DELAY = 0.01
+
+
+def run_serial(urls):
+    results = []
+    for url in urls:
+        response = requests.get(url, timeout=10)
+        results.append(response.json() if response.status_code == 200 else None)
+    return results
+
+
+def report(name, seconds, results, connections):
+    ok = sum(1 for data in results if data is not None)
+    print(f"{name:<14} {seconds:>8.2f}s {len(results) / seconds:>10.0f}"
+          f" {ok:>6}/{len(results)} {connections:>8}")
+
+
+if __name__ == "__main__":
+    with LocalServer(response_delay=SERVER_DELAY) as server:
+        urls = [f'{server.url}/posts/{i}' for i in range(1, TOTAL + 1)]
+
+        print("=" * 60)
+        print(f"共 {TOTAL} 个请求，服务端耗时 {SERVER_DELAY * 1000:.0f}ms/请求")
+        print(f"{'方式':<14} {'总耗时':>9} {'请求/秒':>10} {'成功':>10} {'新建连接':>8}")
+        print("=" * 60)
+
+        connections = server.connection_count
+        start = time.perf_counter()
+        results = run_serial(urls)
+        report("串行 for 循环", time.perf_counter() - start, results,
+               server.connection_count - connections)
+
+        for concurrency in (1, 5, 10, 20, 50, 100):
+            connections = server.connection_count
+            start = time.perf_counter()
+            results = asyncio.run(fetch_many(urls, concurrency=concurrency))
+            report(f"并发 {concurrency}", time.perf_counter() - start, results,
+                   server.connection_count - connections)
+
+        print("=" * 60)
+        print("💡 fetch_many 的新建连接数 ≈ 并发数，其余请求全部复用连接池")
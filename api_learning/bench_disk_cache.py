@@ -0,0 +1,70 @@
+"""
+磁盘缓存性能测试
+模拟 02_api_with_proxy.py 的主程序：依次请求 6 个接口，
+对比"第一次运行（缓存为空）"和"重启后再运行（304 重新验证）"的总耗时和下载量
+本地服务器按 2MB/s 的带宽模拟下载耗时，304 不带正文
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+
+from api_client import APIClient
+from disk_cache import DiskCache
+from local_server import LocalServer
+
+BANDWIDTH = 2 * 1024 * 1024  # 字节/秒
+
+# 6 个接口，正文大小不同（字节）
+ENDPOINTS = {
+    '/jokes/programming/random': 2_000,
+    '/api/': 5_000,
+    '/fact': 500,
+    '/json/': 1_000,
+    '/users/torvalds': 1_500,
+    '/posts': 300_000,
+}
+
+
+def etag_route(path, query, headers):
+    """带 ETag 的路由：客户端的 If-None-Match 对得上就回 304"""
+    body = ('x' * ENDPOINTS[path]).encode()
+    etag = '"' + hashlib.md5(body).hexdigest() + '"'
+    if headers.get('If-None-Match') == etag:
+        return 304, b'', {'ETag': etag}
+
+    time.sleep(len(body) / BANDWIDTH)
+    return 200, b'{"data": "' + body + b'"}', {'ETag': etag}
+
+
+def run_main_block(base_url, cache_path):
+    """相当于一次完整的程序运行：新建客户端和缓存，把所有接口请求一遍"""
+    start = time.perf_counter()
+    disk_cache = DiskCache(cache_path)
+    with APIClient(disk_cache=disk_cache) as client:
+        for path in ENDPOINTS:
+            client.get_json(base_url + path)
+    revalidated = disk_cache.revalidated
+    disk_cache.close()
+    return time.perf_counter() - start, revalidated
+
+
+if __name__ == "__main__":
+    routes = {path: etag_route for path in ENDPOINTS}
+
+    with LocalServer(routes=routes) as server, tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'http_cache.sqlite3')
+
+        print("=" * 60)
+        print(f"{'运行':<12} {'总耗时':>10} {'下载字节':>12} {'304次数':>8}")
+        print("=" * 60)
+
+        for name in ("冷启动", "重启后 #1", "重启后 #2"):
+            sent = server.bytes_sent
+            seconds, revalidated = run_main_block(server.url, cache_path)
+            print(f"{name:<12} {seconds * 1000:>8.1f}ms {server.bytes_sent - sent:>12}"
+                  f" {revalidated:>8}")
+
+    print("=" * 60)
+    print("💡 重启后每个请求仍然要走一次网络往返，但正文不再重新下载")
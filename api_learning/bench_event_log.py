@@ -0,0 +1,88 @@
+"""
+事件日志开销测试
+用假的客户端（不发网络请求）调用 10000 次 02_api_with_proxy.api_request，
+对比原来的 print 写法和 event_log 的文本 / JSON / 安静模式，每次调用的平均耗时。
+输出都写到 /dev/null，只比较格式化和写入本身的开销
+"""
+
+import contextlib
+import datetime
+import importlib
+import os
+import sys
+import time
+
+from event_log import INFO, QUIET, log
+from json_backend import response_json
+
+TOTAL = 10_000
+
+
+class FakeResponse:
+    status_code = 200
+    elapsed = datetime.timedelta(milliseconds=123)
+    content = b'{"ip": "1.2.3.4", "city": "Tokyo"}'
+    proxy_name = 'HTTP - 端口10808'
+    timings = {'ttfb': 0.1, 'download': 0.002, 'total': 0.102}
+
+
+class FakeClient:
+    def get(self, url, **kwargs):
+        return FakeResponse()
+
+
+def print_request(url, description):
+    """原来 api_request 的 print 写法（作为对照）"""
+    print("=" * 60)
+    print(f"请求: {description}")
+    print("=" * 60)
+    print(f"🌐 URL: {url}")
+    response = FakeClient().get(url)
+    if response.status_code == 200:
+        print(f"✓ 成功！状态码: {response.status_code}")
+        print(f"⏱️  响应时间: {response.elapsed.total_seconds():.2f}秒")
+        print("   " + " | ".join(f"{phase} {seconds * 1000:.0f}ms"
+                                for phase, seconds in response.timings.items()))
+        print(f"🔀 代理: {response.proxy_name}")
+        return response_json(response)
+    return None
+
+
+def run(func):
+    start = time.perf_counter()
+    for i in range(TOTAL):
+        func(f"https://api.example.com/items/{i}", "测试接口")
+    return (time.perf_counter() - start) / TOTAL * 1e6
+
+
+if __name__ == "__main__":
+    # 02_api_with_proxy 的客户端是第一次用到时才创建的，先换成假客户端就不会真的创建
+    script = importlib.import_module('02_api_with_proxy')
+    script.client = FakeClient()
+
+    with open(os.devnull, 'w', encoding='utf-8') as devnull:
+        cases = []
+
+        with contextlib.redirect_stdout(devnull):
+            cases.append(("print（原来的写法）", run(print_request)))
+
+        log.configure(level=INFO, fmt='text', stream=devnull)
+        cases.append(("event_log 文本", run(script.api_request)))
+
+        log.configure(fmt='json')
+        cases.append(("event_log JSON", run(script.api_request)))
+
+        log.configure(level=QUIET)
+        cases.append(("event_log 安静模式", run(script.api_request)))
+
+        log.configure(level=INFO, fmt='text', stream=sys.stdout)
+
+    print("=" * 48)
+    print(f"{TOTAL} 次 api_request（假客户端），每次调用的平均耗时")
+    print("=" * 48)
+    baseline = cases[0][1]
+    for name, micros in cases:
+        print(f"{name:<20} {micros:>8.1f} µs {baseline / micros:>8.1f}x")
+    print("=" * 48)
+    print("💡 文本模式比直接 print 多一点开销（换来可过滤、可输出JSON）；\n"
+          "   安静模式下被过滤的日志不做任何格式化，只剩一次级别比较")
@@ -0,0 +1,62 @@
+"""
+JSON解码后端性能测试
+用 jsonplaceholder 风格的文章列表，按几种大小对比每个已安装后端的解析速度，
+以及直接解码成 Post 数据类的开销。没装的后端不会出现在结果里
+"""
+
+import json
+import time
+
+import json_backend
+from json_backend import Post
+
+SIZES = [1, 100, 10_000]
+
+
+def make_payload(count):
+    posts = [
+        {
+            'userId': i // 10 + 1,
+            'id': i + 1,
+            'title': f'文章标题 {i + 1} sunt aut facere repellat',
+            'body': 'quia et suscipit\nsuscipit recusandae consequuntur ' * 3,
+        }
+        for i in range(count)
+    ]
+    return json.dumps(posts, ensure_ascii=False).encode('utf-8')
+
+
+def best_time(func, data, min_total=0.2):
+    """反复执行到总时长超过 min_total，取单次最短时间（微秒）"""
+    best = float('inf')
+    total = 0.0
+    while total < min_total:
+        start = time.perf_counter()
+        func(data)
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+    return best * 1e6
+
+
+if __name__ == "__main__":
+    backends = json_backend.available_backends()
+    print(f"当前使用的后端: {json_backend.BACKEND}")
+
+    header = f"{'大小':>14}" + ''.join(f" {name:>12}" for name in backends) + f" {'→Post':>12}"
+    print("=" * len(header))
+    print("单次解析耗时（微秒）")
+    print(header)
+    print("=" * len(header))
+
+    for count in SIZES:
+        data = make_payload(count)
+        label = f"{count}条/{len(data) / 1024:.0f}KB"
+        row = f"{label:>14}"
+        for loads in backends.values():
+            row += f" {best_time(loads, data):>12.1f}"
+        row += f" {best_time(lambda d: json_backend.decode(d, Post, many=True), data):>12.1f}"
+        print(row)
+
+    print("=" * len(header))
+    print("💡 →Post 一列是用当前后端解析并构造成数据类（装了 msgspec 时一步完成）")
@@ -0,0 +1,86 @@
+"""
+流式JSON解析性能测试
+本地服务器返回一个几MB的 /comments 列表（字段和 jsonplaceholder 一样），按 20MB/s 限速发送。
+对比 response.json() 和 APIClient.stream_items()：
+拿到第一个元素要等多久、处理完全部要多久、解析过程中的内存峰值（tracemalloc）
+"""
+
+import json
+import time
+import tracemalloc
+
+from api_client import APIClient
+from local_server import LocalServer
+
+TOTAL = 20_000
+BANDWIDTH = 20 * 1024 * 1024  # 字节/秒
+
+COMMENTS = json.dumps([
+    {
+        'postId': i // 5 + 1,
+        'id': i + 1,
+        'name': f'comment {i + 1} 评论标题',
+        'email': f'user{i}@example.com',
+        'body': '这是一条评论的正文，内容随便写一点。 ' * 6,
+    }
+    for i in range(TOTAL)
+], ensure_ascii=False).encode('utf-8')
+
+
+def comments_route(path, query, headers):
+    return 200, COMMENTS
+
+
+def process(item, totals):
+    # 模拟对每个元素的处理：只留下需要的统计结果
+    totals[item['postId']] = totals.get(item['postId'], 0) + len(item['body'])
+
+
+def run_buffered(client, url):
+    totals = {}
+    start = time.perf_counter()
+    first = None
+    for item in client.get(url).json():
+        if first is None:
+            first = time.perf_counter() - start
+        process(item, totals)
+    return first, time.perf_counter() - start, len(totals)
+
+
+def run_streaming(client, url):
+    totals = {}
+    start = time.perf_counter()
+    first = None
+    for item in client.stream_items(url):
+        if first is None:
+            first = time.perf_counter() - start
+        process(item, totals)
+    return first, time.perf_counter() - start, len(totals)
+
+
+def measure(name, run, client, url):
+    tracemalloc.start()
+    first, total, posts = run(client, url)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{name:<18} {first * 1000:>10.0f} {total * 1000:>10.0f}"
+          f" {peak / 1024 / 1024:>10.1f} {posts:>8}")
+
+
+if __name__ == "__main__":
+    with LocalServer(routes={'/comments': comments_route}, bandwidth=BANDWIDTH) as server, \
+            APIClient() as client:
+        url = f'{server.url}/comments'
+        client.get(url).content  # 预热连接
+
+        print("=" * 60)
+        print(f"/comments: {TOTAL} 条，{len(COMMENTS) / 1024 / 1024:.1f} MB，"
+              f"限速 {BANDWIDTH / 1024 / 1024:.0f} MB/s")
+        print(f"{'方式':<18} {'首个元素ms':>10} {'总耗时ms':>10} {'峰值MB':>10} {'帖子数':>8}")
+        print("=" * 60)
+
+        measure("response.json()", run_buffered, client, url)
+        measure("stream_items()", run_streaming, client, url)
+
+    print("=" * 60)
+    print("💡 流式解析第一个元素几乎马上就到，内存峰值只和分块大小有关，不随列表长度增长")
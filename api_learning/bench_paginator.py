@@ -0,0 +1,83 @@
+"""
+分页预取性能测试
+本地服务器提供 1000 条数据，用四种翻页方式分页（每页 50 条，每个请求服务端耗时 20ms），
+调用方处理每条数据要 0.4ms（一页大约 20ms）。
+对比一页页顺序请求和"处理当前页时预取下一页"的总耗时
+"""
+
+import time
+
+from api_client import APIClient
+from local_server import LocalServer
+from paginator import Cursor, LinkHeader, Offset, PageNumber, paginate
+
+TOTAL = 1000
+PAGE_SIZE = 50
+RESPONSE_DELAY = 0.02
+PROCESS_TIME = 0.0004
+
+ITEMS = [{'id': i, 'title': f'item {i}'} for i in range(TOTAL)]
+
+
+def page_route(path, query, headers):
+    page, size = int(query['page']), int(query['per_page'])
+    return 200, ITEMS[(page - 1) * size:page * size]
+
+
+def offset_route(path, query, headers):
+    offset, limit = int(query['offset']), int(query['limit'])
+    return 200, {'items': ITEMS[offset:offset + limit]}
+
+
+def cursor_route(path, query, headers):
+    start = int(query.get('cursor', 0))
+    end = start + PAGE_SIZE
+    return 200, {'data': ITEMS[start:end], 'meta': {'next_cursor': str(end) if end < TOTAL else None}}
+
+
+def link_route(path, query, headers):
+    page = int(query.get('page', 1))
+    response_headers = {}
+    if page * PAGE_SIZE < TOTAL:
+        next_url = f"http://{headers['Host']}{path}?page={page + 1}"
+        response_headers['Link'] = f'<{next_url}>; rel="next"'
+    return 200, ITEMS[(page - 1) * PAGE_SIZE:page * PAGE_SIZE], response_headers
+
+
+CASES = [
+    ('页码', '/page', PageNumber(page_size=PAGE_SIZE)),
+    ('偏移量', '/offset', Offset(page_size=PAGE_SIZE, items_key='items')),
+    ('游标', '/cursor', Cursor(cursor_key='meta.next_cursor')),
+    ('Link头', '/link', LinkHeader()),
+]
+
+
+def consume(client, url, style, prefetch):
+    start = time.perf_counter()
+    count = 0
+    for item in paginate(client, url, style, prefetch=prefetch):
+        time.sleep(PROCESS_TIME)  # 模拟处理每条数据
+        count += 1
+    assert count == TOTAL, count
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    routes = {'/page': page_route, '/offset': offset_route, '/cursor': cursor_route,
+              '/link': link_route}
+
+    with LocalServer(routes=routes, response_delay=RESPONSE_DELAY) as server, \
+            APIClient() as client:
+        print("=" * 52)
+        print(f"{TOTAL} 条，每页 {PAGE_SIZE} 条，单位 ms")
+        print(f"{'翻页方式':<10} {'顺序请求':>10} {'预取下一页':>10} {'加速':>8}")
+        print("=" * 52)
+
+        for name, path, style in CASES:
+            sequential = consume(client, server.url + path, style, prefetch=False)
+            prefetched = consume(client, server.url + path, style, prefetch=True)
+            print(f"{name:<10} {sequential * 1000:>12.0f} {prefetched * 1000:>12.0f}"
+                  f" {sequential / prefetched:>9.2f}x")
+
+    print("=" * 52)
+    print("💡 预取让网络等待和数据处理重叠，总耗时接近两者中较慢的那个，而不是两者之和")
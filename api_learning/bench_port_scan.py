@@ -0,0 +1,106 @@
+"""
+端口扫描性能测试
+对比串行 check_port_open 和并发 scan_ports_concurrent
+在本机开几个监听端口当"假代理"，再开一些"黑洞"端口模拟被防火墙丢包的端口，
+分别扫描 18 个端口和 10000 个端口
+"""
+
+import socket
+import time
+from contextlib import contextmanager
+
+from find_proxy import check_port_open, find_open_ports
+
+COMMON_PORTS = [
+    1080, 1081, 1082, 1087, 7890, 7891, 7892, 10808, 10809,
+    8080, 8081, 8888, 5000, 5001, 5002, 9050, 9150, 3128,
+]
+
+
+@contextmanager
+def local_listeners(count=3):
+    """在127.0.0.1上开几个监听端口（系统自动分配端口号）"""
+    sockets = []
+    try:
+        for _ in range(count):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(('127.0.0.1', 0))
+            sock.listen(128)
+            sockets.append(sock)
+        yield [sock.getsockname()[1] for sock in sockets]
+    finally:
+        for sock in sockets:
+            sock.close()
+
+
+@contextmanager
+def blackhole_listeners(count=18):
+    """
+    模拟被防火墙丢包的端口
+    listen(0) 后把等待队列塞满，之后新的连接SYN会被内核丢掉，
+    connect 只能等满 timeout —— 和真实环境里的"过滤端口"一样
+    """
+    servers, fillers = [], []
+    try:
+        for _ in range(count):
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.bind(('127.0.0.1', 0))
+            server.listen(0)
+            servers.append(server)
+            port = server.getsockname()[1]
+            for _ in range(2):
+                filler = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                filler.setblocking(False)
+                filler.connect_ex(('127.0.0.1', port))
+                fillers.append(filler)
+        time.sleep(0.1)
+        yield [server.getsockname()[1] for server in servers]
+    finally:
+        for sock in fillers + servers:
+            sock.close()
+
+
+def scan_serial(ports):
+    """原来的写法：一个一个扫"""
+    return [port for port in ports if check_port_open(port)]
+
+
+def run_case(name, ports, max_workers):
+    start = time.perf_counter()
+    serial = scan_serial(ports)
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    concurrent = find_open_ports(ports, max_workers=max_workers)
+    concurrent_time = time.perf_counter() - start
+
+    assert sorted(serial) == concurrent, "串行和并发结果不一致"
+
+    print(f"{name:<16} {len(ports):>7} {serial_time:>10.3f}s {concurrent_time:>10.3f}s"
+          f" {len(concurrent):>6}")
+
+
+if __name__ == "__main__":
+    with local_listeners(3) as listening, blackhole_listeners(18) as filtered:
+        print(f"🔧 本地监听端口: {listening}")
+        print(f"🔧 黑洞端口: {len(filtered)} 个\n")
+
+        print("=" * 60)
+        print(f"{'场景':<16} {'端口数':>7} {'串行':>11} {'并发':>11} {'开放':>6}")
+        print("=" * 60)
+
+        # 18个端口：本机关闭的端口会立即返回RST，几乎不花时间
+        run_case("18端口(关闭)", COMMON_PORTS, max_workers=64)
+
+        # 18个端口：全部被"防火墙"丢包，串行要 18 × 0.5 秒
+        run_case("18端口(丢包)", filtered, max_workers=64)
+
+        # 10000个端口：监听端口附近的一段区间 + 全部黑洞端口
+        low = max(1, min(listening) - 5000)
+        wide_range = set(range(low, low + 10000 - len(filtered)))
+        wide_range.update(filtered)
+        run_case("10000端口", sorted(wide_range), max_workers=500)
+
+    print("=" * 60)
+    print("💡 串行扫描的耗时 ≈ 丢包端口数 × timeout，")
+    print("   并发扫描的耗时 ≈ (端口数 / max_workers) × timeout")
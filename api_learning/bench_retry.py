@@ -0,0 +1,70 @@
+"""
+重试策略测试
+本地服务器随机注入故障：10% 返回 503、5% 返回 429（带 Retry-After: 0）、
+5% 故意卡住超过客户端超时。对比不重试和几种重试策略的成功率与延迟分位数
+"""
+
+import random
+import statistics
+import time
+
+import requests
+
+from api_client import APIClient
+from local_server import LocalServer
+from retry_policy import RetryPolicy
+
+TOTAL = 400
+TIMEOUT = 0.2
+
+_rng = random.Random(42)
+
+
+def flaky_route(path, query, headers):
+    roll = _rng.random()
+    if roll < 0.10:
+        return 503, {'error': 'service unavailable'}
+    if roll < 0.15:
+        return 429, {'error': 'too many requests'}, {'Retry-After': '0'}
+    if roll < 0.20:
+        time.sleep(TIMEOUT * 2)  # 超过客户端超时
+    return 200, {'path': path}
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def run_case(name, server, retry):
+    timings, ok = [], 0
+    with APIClient(timeout=TIMEOUT, retry=retry) as client:
+        for i in range(TOTAL):
+            start = time.perf_counter()
+            try:
+                if client.get(f'{server.url}/posts/{i}').status_code == 200:
+                    ok += 1
+            except requests.RequestException:
+                pass
+            timings.append((time.perf_counter() - start) * 1000)
+
+    print(f"{name:<22} {ok / TOTAL:>7.1%} {statistics.median(timings):>8.1f}"
+          f" {percentile(timings, 90):>8.1f} {percentile(timings, 99):>8.1f}"
+          f" {max(timings):>8.1f}")
+
+
+if __name__ == "__main__":
+    with LocalServer(default=flaky_route) as server:
+        print("=" * 66)
+        print(f"{TOTAL} 个请求，客户端超时 {TIMEOUT * 1000:.0f}ms，单位 ms")
+        print(f"{'策略':<22} {'成功率':>7} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+        print("=" * 66)
+
+        run_case("不重试", server, None)
+        run_case("3次, 退避10ms", server, RetryPolicy(max_attempts=3, backoff=0.01))
+        run_case("5次, 退避10ms", server, RetryPolicy(max_attempts=5, backoff=0.01))
+        run_case("5次, 总时限300ms", server,
+                 RetryPolicy(max_attempts=5, backoff=0.01, deadline=0.3))
+
+    print("=" * 66)
+    print("💡 重试把成功率拉高，代价是尾部延迟变长；deadline 可以把最坏情况限制住")
@@ -0,0 +1,225 @@
+"""
+离线录制 / 回放
+所有脚本都依赖外网接口，网络一抖动，测出来的性能数字就没法比较，没网时脚本也跑不起来。
+Cassette 替换 requests 的 HTTPAdapter.send（requests.get、APIClient 都经过它）：
+
+    record  真正发请求，把响应记到 cassette 文件里
+    replay  不联网，直接返回记录的响应（可以加固定的模拟延迟）；没记录过的请求抛 ConnectionError
+    auto    有记录就回放，没有就真正请求并记录下来
+
+文件是 gzip 压缩的JSON，只保存状态码、少量有用的响应头和正文。同一个URL记录了多次时
+（比如随机笑话），回放时按顺序轮流返回。
+
+在脚本里用环境变量开启（见 install_from_env）：
+    API_CASSETTE=cassettes/apis.json.gz API_CASSETTE_MODE=record python 02_api_with_proxy.py
+    API_CASSETTE=cassettes/apis.json.gz API_CASSETTE_LATENCY=0.05 python 02_api_with_proxy.py
+"""
+
+import atexit
+import base64
+import datetime
+import gzip
+import io
+import json
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3 import HTTPResponse
+
+MODES = ('record', 'replay', 'auto')
+
+# 只保存这些响应头，其余的（日期、服务器、Cookie……）回放时用不到
+KEPT_HEADERS = (
+    'Content-Type', 'ETag', 'Last-Modified', 'Cache-Control', 'Link', 'Location', 'Retry-After',
+    'X-RateLimit-Limit', 'X-RateLimit-Remaining', 'X-RateLimit-Reset',
+)
+
+_original_send = HTTPAdapter.send
+_active = None  # 当前安装的 Cassette
+
+
+def request_key(request):
+    return f'{request.method} {request.url}'
+
+
+def _encode_body(body):
+    try:
+        return body.decode('utf-8'), None
+    except UnicodeDecodeError:
+        return base64.b64encode(body).decode('ascii'), 'base64'
+
+
+def _decode_body(text, encoding):
+    return base64.b64decode(text) if encoding == 'base64' else text.encode('utf-8')
+
+
+class Cassette:
+    """
+    path: cassette 文件路径（.json.gz）
+    mode: 'record' / 'replay' / 'auto'
+    latency: 回放时每个响应等待多少秒，模拟网络延迟
+    jitter: 延迟的随机浮动比例（0.2 表示 ±20%），随机数种子固定，每次运行结果一样
+    """
+
+    def __init__(self, path, mode='replay', latency=0.0, jitter=0.0, seed=0):
+        if mode not in MODES:
+            raise ValueError(f'mode 只能是 {MODES} 之一')
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self.interactions = {}  # 请求 -> [响应, ...]
+        self.recorded = 0
+        self.replayed = 0
+        self._positions = {}
+        self._rng = random.Random(seed)
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                self.interactions = json.load(f)['interactions']
+        except FileNotFoundError:
+            if self.mode == 'replay':
+                raise
+            self.interactions = {}
+
+    def save(self):
+        """有新录制的内容时写回文件（先写临时文件再替换）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + '.tmp'
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump({'version': 1, 'interactions': self.interactions}, f,
+                          ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def _record(self, request, response):
+        body, encoding = _encode_body(response.content)
+        entry = {
+            'status': response.status_code,
+            'reason': response.reason,
+            'headers': {name: response.headers[name] for name in KEPT_HEADERS
+                        if name in response.headers},
+            'body': body,
+        }
+        if encoding:
+            entry['encoding'] = encoding
+        with self._lock:
+            self.interactions.setdefault(request_key(request), []).append(entry)
+            self.recorded += 1
+            self._dirty = True
+
+    def _next_entry(self, key):
+        with self._lock:
+            entries = self.interactions.get(key)
+            if not entries:
+                return None
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            self.replayed += 1
+            delay = self.latency
+            if self.jitter:
+                delay *= 1 + self._rng.uniform(-self.jitter, self.jitter)
+            return entries[position % len(entries)], delay
+
+    def _replay(self, request, entry, delay):
+        if delay > 0:
+            time.sleep(delay)
+
+        content = _decode_body(entry['body'], entry.get('encoding'))
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry.get('reason')
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response._content = content
+        # 正文已经在内存里了：iter_content（stream=True 的用法）直接按块切 _content；
+        # 再给一个真的 raw，close() 和直接读 raw 的代码也能正常工作
+        response._content_consumed = True
+        response.raw = HTTPResponse(body=io.BytesIO(content), headers=entry['headers'],
+                                    status=entry['status'], preload_content=False)
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.elapsed = datetime.timedelta(seconds=delay)
+        response.replayed = True
+        return response
+
+    def send(self, adapter, request, **kwargs):
+        """代替 HTTPAdapter.send"""
+        key = request_key(request)
+        if self.mode != 'record':
+            found = self._next_entry(key)
+            if found is not None:
+                return self._replay(request, *found)
+            if self.mode == 'replay':
+                raise requests.ConnectionError(f'cassette 里没有这个请求的记录: {key}',
+                                               request=request)
+
+        response = _original_send(adapter, request, **kwargs)
+        self._record(request, response)
+        return response
+
+    def install(self):
+        """替换 HTTPAdapter.send，之后所有 requests 请求都经过这个 cassette"""
+        global _active
+        if _active is not None:
+            raise RuntimeError('已经安装了一个 cassette')
+        _active = self
+
+        def send(adapter, request, **kwargs):
+            return self.send(adapter, request, **kwargs)
+
+        HTTPAdapter.send = send
+        return self
+
+    def uninstall(self):
+        """恢复原来的 HTTPAdapter.send，并保存录制的内容"""
+        global _active
+        if _active is self:
+            HTTPAdapter.send = _original_send
+            _active = None
+        self.save()
+
+    def __enter__(self):
+        return self.install()
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+
+def install_from_env(environ=None):
+    """
+    按环境变量安装 cassette，没设置 API_CASSETTE 时什么都不做，返回 None
+        API_CASSETTE          cassette 文件路径
+        API_CASSETTE_MODE     record / replay / auto（默认 auto）
+        API_CASSETTE_LATENCY  回放延迟（秒，默认 0）
+        API_CASSETTE_JITTER   延迟浮动比例（默认 0）
+    录制的内容在程序退出时保存
+    """
+    environ = os.environ if environ is None else environ
+    path = environ.get('API_CASSETTE')
+    if not path:
+        return None
+
+    cassette = Cassette(
+        path,
+        mode=environ.get('API_CASSETTE_MODE', 'auto'),
+        latency=float(environ.get('API_CASSETTE_LATENCY', 0)),
+        jitter=float(environ.get('API_CASSETTE_JITTER', 0)),
+    )
+    cassette.install()
+    atexit.register(cassette.uninstall)
+    return cassette
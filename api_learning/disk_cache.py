@@ -0,0 +1,133 @@
+"""
+磁盘HTTP缓存（SQLite版）
+把响应正文和 ETag / Last-Modified 存到本地数据库，程序重启后再请求同一个URL时
+带上 If-None-Match / If-Modified-Since，服务器回 304 就直接用本地存的正文，
+不用重新下载
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL
+)
+"""
+
+
+class DiskCache:
+    """
+    带条件请求的磁盘缓存（线程安全）
+
+    path: SQLite 文件路径，传 ':memory:' 时只存在内存里（测试用）
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.revalidated = 0  # 服务器回了304，用的本地正文
+        self.stored = 0
+
+    def _row(self, url):
+        with self._lock:
+            return self._conn.execute(
+                'SELECT status, headers, body, etag, last_modified FROM responses WHERE url = ?',
+                (url,),
+            ).fetchone()
+
+    def conditional_headers(self, url):
+        """这个URL有缓存时，返回要附加的条件请求头"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT etag, last_modified FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+        if row is None:
+            return {}
+
+        etag, last_modified = row
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def store(self, url, response):
+        """保存状态码200、并且带 ETag 或 Last-Modified 的响应"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if response.status_code != 200 or not (etag or last_modified):
+            return
+
+        # response.content 已经解压过了，不再保留压缩/分块相关的头
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in ('content-encoding', 'transfer-encoding')
+        }
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (url, response.status_code, json.dumps(headers),
+                 response.content, etag, last_modified, time.time()),
+            )
+            self._conn.commit()
+            self.stored += 1
+
+    def revalidate(self, url, not_modified):
+        """
+        服务器回了304：用本地存的正文拼出一个完整的 200 响应
+        找不到本地记录时返回 None
+        """
+        row = self._row(url)
+        if row is None:
+            return None
+
+        status, headers, body, _, _ = row
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        # 304 里带回来的新头（比如新的 ETag、Date）覆盖旧的
+        response.headers.update(not_modified.headers)
+        response.headers['Content-Length'] = str(len(body))
+        response._content = body
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response.revalidated = True
+
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET stored_at = ? WHERE url = ?', (time.time(), url)
+            )
+            self._conn.commit()
+            self.revalidated += 1
+        return response
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
@@ -0,0 +1,108 @@
+"""
+结构化事件日志
+代替到处 print 的诊断信息：每条日志是一个事件（名字 + 字段），可以按级别过滤，
+输出成给人看的文本，或者一行一个JSON（方便 grep / jq / 导入分析工具）。
+
+格式化是惰性的：消息模板只有在这条日志真的要输出时才会 format，
+被级别过滤掉的日志（包括安静模式）几乎没有开销，放在循环里也不怕。
+
+环境变量：
+    API_LOG_LEVEL   debug / info / warning / error / quiet（默认 info）
+    API_LOG_FORMAT  text / json（默认 text）
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+QUIET = 100  # 什么都不输出
+
+LEVELS = {'debug': DEBUG, 'info': INFO, 'warning': WARNING, 'error': ERROR, 'quiet': QUIET}
+_LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+# 文本模式下常用的分隔线，只在这里拼一次
+RULE = '=' * 60
+
+
+class EventLog:
+    """
+    level: 低于这个级别的事件直接丢掉（不格式化）
+    fmt: 'text' 输出格式化后的消息，'json' 每个事件输出一行JSON
+    stream: 输出到哪里，默认 sys.stdout
+    """
+
+    def __init__(self, level=INFO, fmt='text', stream=None):
+        self.level = level
+        self.fmt = fmt
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def enabled(self, level):
+        """这个级别会不会输出（要先算一些只给日志用的数据时，可以先判断一下）"""
+        return level >= self.level
+
+    def emit(self, level, event, message=None, **fields):
+        """
+        记录一个事件
+        message: 文本模式的消息模板，用 fields 来 format；也可以是函数 message(fields) -> str
+        """
+        if level >= self.level:
+            self._write(level, event, message, fields)
+
+    def _write(self, level, event, message, fields):
+        if self.fmt == 'json':
+            record = {'ts': round(time.time(), 3), 'level': _LEVEL_NAMES.get(level, level),
+                      'event': event}
+            record.update(fields)
+            line = json.dumps(record, ensure_ascii=False, default=str)
+        elif message is None:
+            line = event + ''.join(f' {key}={value}' for key, value in fields.items())
+        elif callable(message):
+            line = message(fields)
+        else:
+            line = message.format(**fields) if fields else message
+
+        with self._lock:
+            (self.stream or sys.stdout).write(line + '\n')
+
+    def debug(self, event, message=None, **fields):
+        if DEBUG >= self.level:
+            self._write(DEBUG, event, message, fields)
+
+    def info(self, event, message=None, **fields):
+        if INFO >= self.level:
+            self._write(INFO, event, message, fields)
+
+    def warning(self, event, message=None, **fields):
+        if WARNING >= self.level:
+            self._write(WARNING, event, message, fields)
+
+    def error(self, event, message=None, **fields):
+        if ERROR >= self.level:
+            self._write(ERROR, event, message, fields)
+
+    def configure(self, level=None, fmt=None, stream=None):
+        """修改级别 / 格式 / 输出位置；level 可以是数字或 'info' 这样的名字"""
+        if level is not None:
+            self.level = LEVELS[level] if isinstance(level, str) else level
+        if fmt is not None:
+            self.fmt = fmt
+        if stream is not None:
+            self.stream = stream
+
+    def quiet(self):
+        """安静模式：所有事件都不输出，也不格式化"""
+        self.level = QUIET
+
+
+# 所有模块共用的日志对象
+log = EventLog(
+    level=LEVELS.get(os.environ.get('API_LOG_LEVEL', 'info').lower(), INFO),
+    fmt=os.environ.get('API_LOG_FORMAT', 'text').lower(),
+)
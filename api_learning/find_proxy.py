@@ -3,152 +3,251 @@
 """
 
 import socket
-import requests
-import urllib3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from event_log import RULE, log
 
+_requests = None
 
-def check_port_open(port):
+
+def _get_requests():
+    """
+    requests 导入要上百毫秒，只扫端口时用不到，等第一次真正发请求时再导入
+    顺便禁用SSL警告（验证代理时 verify=False）
+    """
+    global _requests
+    if _requests is None:
+        import requests
+        import urllib3
+
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        _requests = requests
+    return _requests
+
+
+def check_port_open(port, host='127.0.0.1', timeout=0.5):
     """检查端口是否开放"""
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.settimeout(0.5)
-    result = sock.connect_ex(('127.0.0.1', port))
-    sock.close()
+    sock.settimeout(timeout)
+    try:
+        result = sock.connect_ex((host, port))
+    finally:
+        sock.close()
     return result == 0
 
 
-def test_proxy_port(port, proxy_type='http'):
-    """测试指定端口是否是可用的代理"""
-    if proxy_type == 'http':
-        proxies = {
-            'http': f'http://127.0.0.1:{port}',
-            'https': f'http://127.0.0.1:{port}',
-        }
-    else:  # socks5
-        proxies = {
-            'http': f'socks5://127.0.0.1:{port}',
-            'https': f'socks5://127.0.0.1:{port}',
+def scan_ports_concurrent(ports, host='127.0.0.1', timeout=0.5, max_workers=200):
+    """
+    并发扫描端口（线程池版）
+    每个端口一个探测任务，最多 max_workers 个同时进行，
+    哪个端口先有结果就先 yield (port, is_open)，不保证顺序
+    """
+    ports = list(ports)
+    if not ports:
+        return
+
+    workers = max(1, min(max_workers, len(ports)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(check_port_open, port, host, timeout): port
+            for port in ports
         }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def find_open_ports(ports, host='127.0.0.1', timeout=0.5, max_workers=200):
+    """并发扫描，只返回开放的端口（按端口号排序）"""
+    return sorted(
+        port
+        for port, is_open in scan_ports_concurrent(ports, host, timeout, max_workers)
+        if is_open
+    )
+
+
+PROXY_TYPES = ('http', 'socks5', 'socks5h')
+TEST_URL = 'https://httpbin.org/ip'
+
+# 常见代理端口列表（扩展版）
+COMMON_PORTS = [
+    1080, 1081, 1082, 1087,  # SOCKS常见端口
+    7890, 7891, 7892,  # Clash常见端口
+    10808, 10809,  # V2Ray常见端口
+    8080, 8081, 8888,  # HTTP代理常见端口
+    5000, 5001, 5002,  # 你说的5001
+    9050, 9150,  # Tor端口
+    3128,  # Squid端口
+]
 
+
+def build_proxy_config(port, proxy_type='http', host='127.0.0.1'):
+    """生成 requests 用的 proxies 字典"""
+    address = f'{proxy_type}://{host}:{port}'
+    return {
+        'http': address,
+        'https': address,
+    }
+
+
+def measure_proxy_latency(port, proxy_type='http', timeout=3, test_url=TEST_URL):
+    """
+    测试代理并测量耗时
+    可用返回耗时（秒），不可用返回 None
+    """
+    return probe_proxies(build_proxy_config(port, proxy_type), timeout, test_url)
+
+
+def probe_proxies(proxies, timeout=3, test_url=TEST_URL):
+    """用一个 proxies 字典请求一次测试地址，可用返回耗时（秒），不可用返回 None"""
+    requests = _get_requests()
+    start = time.perf_counter()
     try:
         response = requests.get(
-            'https://httpbin.org/ip',
+            test_url,
             proxies=proxies,
-            timeout=3,
+            timeout=timeout,
             verify=False
         )
         if response.status_code == 200:
-            return True
-    except:
+            return time.perf_counter() - start
+    except Exception:
         pass
 
-    return False
+    return None
+
+
+def test_proxy_port(port, proxy_type='http', test_url=TEST_URL):
+    """测试指定端口是否是可用的代理（test_url 可以换成本地 mock_server 的 /ip）"""
+    return measure_proxy_latency(port, proxy_type, test_url=test_url) is not None
+
+
+def validate_proxies(ports, proxy_types=PROXY_TYPES, timeout=3, test_url=TEST_URL,
+                     max_workers=32):
+    """
+    并发验证代理
+    所有端口 × 所有协议同时测试，某个端口只要有一种协议先成功就不再等它的其他协议；
+    返回可用代理列表，按测得的延迟从快到慢排序
+    """
+    ports = list(ports)
+    proxy_types = list(proxy_types)
+    if not ports or not proxy_types:
+        return []
+
+    remaining = {port: len(proxy_types) for port in ports}
+    found = {}
+
+    executor = ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(ports) * len(proxy_types)))
+    )
+    try:
+        futures = {
+            executor.submit(measure_proxy_latency, port, proxy_type, timeout, test_url):
+                (port, proxy_type)
+            for port in ports
+            for proxy_type in proxy_types
+        }
+        for future in as_completed(futures):
+            port, proxy_type = futures[future]
+            if port not in remaining:
+                continue  # 这个端口已经有结果了
+
+            latency = future.result()
+            remaining[port] -= 1
+            if latency is not None:
+                found[port] = {
+                    'port': port,
+                    'type': proxy_type,
+                    'latency': latency,
+                    'config': build_proxy_config(port, proxy_type),
+                }
+            if latency is not None or remaining[port] == 0:
+                del remaining[port]
+            if not remaining:
+                break
+    finally:
+        # 已经有结论的端口，剩下还在跑的请求不再等待
+        executor.shutdown(wait=False, cancel_futures=True)
 
+    return sorted(found.values(), key=lambda proxy: proxy['latency'])
 
-def scan_ports():
-    """扫描常见代理端口"""
 
-    print("🔍 正在扫描常见代理端口...\n")
+_RECOMMENDED_CONFIG = """
+# 复制下面的代码到你的脚本开头
+proxies = {config}
 
-    # 常见代理端口列表（扩展版）
-    common_ports = [
-        1080, 1081, 1082, 1087,  # SOCKS常见端口
-        7890, 7891, 7892,  # Clash常见端口
-        10808, 10809,  # V2Ray常见端口
-        8080, 8081, 8888,  # HTTP代理常见端口
-        5000, 5001, 5002,  # 你说的5001
-        9050, 9150,  # Tor端口
-        3128,  # Squid端口
-    ]
+# 使用方法:
+response = requests.get(url, proxies=proxies, verify=False)
+"""
+
+
+def scan_ports(ports=None, max_workers=200):
+    """
+    扫描常见代理端口
+    ports 可以传入任意端口范围，例如 range(1024, 65536)
+    返回可用代理列表（按延迟从快到慢）
+    """
+
+    log.info('scan.start', "🔍 正在扫描常见代理端口...\n")
+
+    common_ports = COMMON_PORTS if ports is None else list(ports)
 
     open_ports = []
-    working_proxies = []
 
     # 第一步：检查哪些端口开放
-    print("=" * 60)
-    print("步骤1: 检查开放的端口")
-    print("=" * 60)
+    log.info('scan.step', RULE + "\n步骤1: 检查开放的端口\n" + RULE, step=1)
 
-    for port in common_ports:
-        if check_port_open(port):
+    # 并发探测，哪个端口先返回结果就先输出
+    for port, is_open in scan_ports_concurrent(common_ports, max_workers=max_workers):
+        if is_open:
             open_ports.append(port)
-            print(f"✓ 端口 {port} 开放")
+            log.info('scan.port_open', "✓ 端口 {port} 开放", port=port)
+    open_ports.sort()
 
     if not open_ports:
-        print("✗ 没有找到开放的常见代理端口")
-        print("\n请检查:")
-        print("1. 代理软件是否正在运行？")
-        print("2. 打开代理软件查看具体端口号")
-        return
+        log.warning('scan.no_open_ports', "✗ 没有找到开放的常见代理端口\n\n请检查:\n"
+                    "1. 代理软件是否正在运行？\n2. 打开代理软件查看具体端口号",
+                    ports=len(common_ports))
+        return []
 
     # 第二步：测试哪些端口是可用的代理
-    print("\n" + "=" * 60)
-    print("步骤2: 测试哪些端口是可用的代理")
-    print("=" * 60)
-
-    for port in open_ports:
-        print(f"\n测试端口 {port}...")
-
-        # 测试HTTP代理
-        if test_proxy_port(port, 'http'):
-            print(f"  ✓ HTTP代理可用!")
-            working_proxies.append({
-                'port': port,
-                'type': 'http',
-                'config': {
-                    'http': f'http://127.0.0.1:{port}',
-                    'https': f'http://127.0.0.1:{port}',
-                }
-            })
-            continue  # 找到HTTP就跳过SOCKS测试
-
-        # 测试SOCKS5代理
-        if test_proxy_port(port, 'socks5'):
-            print(f"  ✓ SOCKS5代理可用!")
-            working_proxies.append({
-                'port': port,
-                'type': 'socks5',
-                'config': {
-                    'http': f'socks5://127.0.0.1:{port}',
-                    'https': f'socks5://127.0.0.1:{port}',
-                }
-            })
+    log.info('scan.step', "\n" + RULE + "\n步骤2: 测试哪些端口是可用的代理\n" + RULE, step=2)
+
+    log.info('scan.validate', "并发测试 {count} 个端口 × {types}...",
+             count=len(open_ports), types='/'.join(PROXY_TYPES).upper())
+    working_proxies = validate_proxies(open_ports)
+
+    for proxy in working_proxies:
+        log.info('scan.proxy_ok', "  ✓ 端口 {port}: {type}代理可用! ({latency_ms:.0f} ms)",
+                 port=proxy['port'], type=proxy['type'].upper(),
+                 latency_ms=proxy['latency'] * 1000)
 
     # 显示结果
-    print("\n" + "=" * 60)
-    print("📊 扫描结果")
-    print("=" * 60)
+    log.info('scan.result', "\n" + RULE + "\n📊 扫描结果\n" + RULE, found=len(working_proxies))
 
     if working_proxies:
-        print(f"\n✓ 找到 {len(working_proxies)} 个可用代理:\n")
+        log.info('scan.found', "\n✓ 找到 {count} 个可用代理:\n", count=len(working_proxies))
 
         for i, proxy in enumerate(working_proxies, 1):
-            print(f"{i}. 端口 {proxy['port']} ({proxy['type'].upper()})")
-            print(f"   配置: proxies = {proxy['config']}\n")
+            log.info('scan.found_proxy', "{rank}. 端口 {port} ({type}, {latency_ms:.0f} ms)\n"
+                     "   配置: proxies = {config}\n",
+                     rank=i, port=proxy['port'], type=proxy['type'].upper(),
+                     latency_ms=proxy['latency'] * 1000, config=proxy['config'])
 
-        # 推荐配置
+        # 推荐配置（延迟最低的那个）
         best = working_proxies[0]
-        print("=" * 60)
-        print("💡 推荐使用配置:")
-        print("=" * 60)
-        print(f"""
-# 复制下面的代码到你的脚本开头
-proxies = {best['config']}
-
-# 使用方法:
-response = requests.get(url, proxies=proxies, verify=False)
-        """)
+        log.info('scan.recommend', RULE + "\n💡 推荐使用配置:\n" + RULE + _RECOMMENDED_CONFIG,
+                 config=best['config'])
 
     else:
-        print("\n✗ 没有找到可用的代理")
-        print("\n可能的原因:")
-        print("1. 代理软件可能使用了其他端口")
-        print("2. 代理可能需要认证")
-        print("3. 代理配置可能有问题")
-        print("\n建议:")
-        print("→ 打开代理软件，查看实际使用的端口")
-        print("→ 或者截图代理软件的设置给我看")
+        log.warning('scan.no_proxy', "\n✗ 没有找到可用的代理\n\n可能的原因:\n"
+                    "1. 代理软件可能使用了其他端口\n2. 代理可能需要认证\n"
+                    "3. 代理配置可能有问题\n\n建议:\n"
+                    "→ 打开代理软件，查看实际使用的端口\n→ 或者截图代理软件的设置给我看",
+                    open_ports=open_ports)
+
+    return working_proxies
 
 
 if __name__ == "__main__":
@@ -156,7 +255,18 @@ if __name__ == "__main__":
     print("代理端口自动扫描工具")
     print("🚀" * 30 + "\n")
 
-    scan_ports()
+    from proxy_discovery import check_cached_proxy, save_proxy
+
+    # 上次找到的代理还能用就不用重新扫描了（加 --rescan 强制重新扫描）
+    cached = None if '--rescan' in sys.argv else check_cached_proxy()
+    if cached:
+        print(f"⚡ 上次找到的代理仍然可用 ({cached['latency'] * 1000:.0f} ms)，跳过扫描")
+        print(f"   配置: proxies = {cached['config']}")
+        print("   需要重新扫描请加参数: python find_proxy.py --rescan")
+    else:
+        working = scan_ports()
+        if working:
+            save_proxy(working[0])
 
     print("\n" + "=" * 60)
     print("如果没找到，请:")
@@ -0,0 +1,148 @@
+"""
+可替换的JSON解码后端
+标准库 json 解析大响应比较慢。装了 orjson / msgspec / ujson 时自动用它们
+（按这个顺序挑第一个能导入的，不带类型解析时 orjson 最快），都没装就退回标准库，调用方式不变。
+
+还可以直接解码成带类型的结构（下面的 Joke / Post / GitHubUser 数据类）：
+装了 msgspec 时由它一步完成解析和类型检查，没装时先解析成字典再挑需要的字段构造。
+"""
+
+import dataclasses
+import json
+from typing import List, Optional
+
+# 这几个库导入要十几毫秒，导入本模块时先不导入，第一次解析JSON时再导入、挑选后端
+msgspec = orjson = ujson = None
+_imported = False
+_loads = None
+
+
+def _import_backends():
+    global msgspec, orjson, ujson, _imported
+    if _imported:
+        return
+    try:
+        import msgspec
+    except ImportError:
+        pass
+    try:
+        import orjson
+    except ImportError:
+        pass
+    try:
+        import ujson
+    except ImportError:
+        pass
+    _imported = True
+
+
+def _msgspec_loads(data):
+    try:
+        return msgspec.json.decode(data)
+    except msgspec.DecodeError as e:
+        raise ValueError(str(e)) from None  # 和其他后端一样抛 ValueError
+
+
+def available_backends():
+    """所有能用的后端 {名字: loads函数}，按优先级排好"""
+    _import_backends()
+    backends = {}
+    if orjson is not None:
+        backends['orjson'] = orjson.loads
+    if msgspec is not None:
+        backends['msgspec'] = _msgspec_loads
+    if ujson is not None:
+        backends['ujson'] = ujson.loads
+    backends['json'] = json.loads
+    return backends
+
+
+def _select_backend():
+    global BACKEND, _loads
+    BACKEND, _loads = next(iter(available_backends().items()))
+
+
+def __getattr__(name):
+    # BACKEND（当前后端的名字）第一次被访问时才挑选
+    if name == 'BACKEND':
+        _select_backend()
+        return BACKEND
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def loads(data):
+    """把 bytes 或 str 解析成 Python 对象，用当前最快的后端"""
+    if _loads is None:
+        _select_backend()
+    return _loads(data)
+
+
+# ============ 脚本里用到的几种响应结构 ============
+
+@dataclasses.dataclass
+class Joke:
+    """official-joke-api 的笑话"""
+    id: int
+    type: str
+    setup: str
+    punchline: str
+
+
+@dataclasses.dataclass
+class Post:
+    """jsonplaceholder 的文章"""
+    userId: int
+    id: int
+    title: str
+    body: str
+
+
+@dataclasses.dataclass
+class GitHubUser:
+    """GitHub /users/{name} 里用到的字段（其余字段忽略）"""
+    login: str
+    name: Optional[str] = None
+    bio: Optional[str] = None
+    followers: int = 0
+    public_repos: int = 0
+
+
+_field_names = {}
+
+
+def _from_dict(schema, obj):
+    # 没有 msgspec 时的退路：只取数据类里定义了的字段，多余的字段忽略
+    names = _field_names.get(schema)
+    if names is None:
+        names = _field_names[schema] = [field.name for field in dataclasses.fields(schema)]
+    return schema(**{name: obj[name] for name in names if name in obj})
+
+
+def decode(data, schema=None, many=False):
+    """
+    解析JSON；给了 schema（数据类）时直接返回 schema 实例，many=True 表示是它的列表
+    JSON格式错误或字段缺失时抛 ValueError（装了 msgspec 时字段类型不对也会抛）
+    """
+    if schema is None:
+        return loads(data)
+
+    if _loads is None:
+        _select_backend()
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(data, type=List[schema] if many else schema)
+        except msgspec.DecodeError as e:  # ValidationError 也是它的子类
+            raise ValueError(str(e)) from None
+
+    obj = loads(data)
+    try:
+        if many:
+            return [_from_dict(schema, item) for item in obj]
+        return _from_dict(schema, obj)
+    except (TypeError, AttributeError) as e:
+        raise ValueError(f'JSON结构和 {schema.__name__} 对不上: {e}') from None
+
+
+def response_json(response, schema=None, many=False):
+    """相当于 response.json()，但用更快的后端，还可以直接解码成 schema"""
+    return decode(response.content, schema, many)
@@ -0,0 +1,118 @@
+"""
+流式JSON解析
+response.json() 要等整个响应下载完，再一次性建好整棵对象树；列表很大时既占内存、又要等。
+这里边下载边解析顶层数组，每解析出一个元素就 yield 出去：
+内存里只留当前这一小段数据，第一个元素到了就能开始处理。
+"""
+
+import codecs
+import json
+
+_WHITESPACE = ' \t\n\r'
+
+# 解析到哪一步了：下一个非空白字符应该是什么
+_START = 0   # 开头的 [
+_FIRST = 1   # 第一个元素，或者 ]（空数组）
+_VALUE = 2   # 逗号后面的元素
+_SEP = 3     # 元素后面的 , 或 ]
+_DONE = 4    # ] 后面只能有空白
+
+# 被截断的记号最长有几个字符（"-Infinit" 是 8 个），留点余量
+_TRUNCATED = 12
+
+
+def _maybe_truncated(error, length):
+    """
+    元素解析失败的原因可能只是数据还没下载完：字符串没结束，
+    或者出错的位置就在数据末尾（被截断的记号，比如 "-Infinit"、"1."、"\\ud83d\\ude0"）
+    """
+    return error.msg.startswith('Unterminated string') or error.pos >= length - _TRUNCATED
+
+
+def iter_json_array(chunks):
+    """
+    从一段段字节（或字符串）里逐个解析出顶层JSON数组的元素
+
+    chunks: 可迭代对象，比如 response.iter_content(chunk_size)
+    顶层不是数组或者JSON格式错误时抛 ValueError（已经解析出的元素会先 yield 出去）；
+    ] 后面的数据也会读完，只允许有空白
+
+    一个元素跨了很多块时，不是每来一块都从头重新解析：等没解析的数据至少翻一倍再试，
+    总的解析量和数据大小成正比；元素中间出现不可能是合法JSON的内容时马上报错，不会一直缓存到结尾
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer = ''
+    pos = 0
+    state = _START
+    pending = []     # 新来的、还没拼进 buffer 的数据
+    pending_size = 0
+    wait_for = 0     # 上次元素没解析完：buffer[pos:] 加上新数据至少要有这么长才再试
+
+    def more_chunks():
+        for chunk in chunks:
+            yield (text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk), False
+        yield text_decoder.decode(b'', final=True), True
+
+    for text, final in more_chunks():
+        pending.append(text)
+        pending_size += len(text)
+        if not final and len(buffer) - pos + pending_size < wait_for:
+            continue
+        buffer = buffer[pos:] + ''.join(pending)
+        pos = 0
+        pending = []
+        pending_size = 0
+        wait_for = 0
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer):
+                break
+
+            char = buffer[pos]
+            if state == _DONE:
+                raise ValueError('JSON数组结尾的 ] 后面还有多余的内容')
+            if state == _START:
+                if char != '[':
+                    raise ValueError('顶层不是JSON数组')
+                state = _FIRST
+                pos += 1
+                continue
+            if char == ']' and state in (_FIRST, _SEP):
+                state = _DONE
+                pos += 1
+                continue
+            if state == _SEP:
+                if char != ',':
+                    raise ValueError('JSON数组的元素之间缺少逗号')
+                state = _VALUE
+                pos += 1
+                continue
+            if char in ',]':
+                raise ValueError('JSON数组里有多余的逗号')  # [,1]、[1,,2]、[1,]
+
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if final:
+                    raise ValueError('JSON格式错误或数据不完整') from None
+                if not _maybe_truncated(e, len(buffer)):
+                    raise ValueError(f'JSON格式错误: {e.msg}') from None
+                wait_for = 2 * (len(buffer) - pos)  # 这个元素还没下载完
+                break
+
+            # 数字没有结束符，要看到后面的分隔符才算完整（"1." 可能只是 "1.5" 的前一半）
+            if not final and (end == len(buffer) or buffer[end] not in _WHITESPACE + ',]'):
+                if end < len(buffer) - _TRUNCATED:
+                    raise ValueError('JSON格式错误: 元素后面有多余的内容')
+                wait_for = 2 * (len(buffer) - pos)
+                break
+
+            yield item
+            pos = end
+            state = _SEP
+
+    if state != _DONE:
+        raise ValueError('JSON数组不完整（缺少结尾的 ]）')
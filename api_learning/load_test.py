@@ -0,0 +1,312 @@
+"""
+压测工具：按配置的请求组合压请求路径，输出吞吐量、错误率和延迟分位数
+    闭环（closed-loop）：N 个并发，每个请求完成后马上发下一个，测最大吞吐
+    开环（open-loop）：按固定速率（--rps）发请求，不管前面的有没有完成；
+                      延迟从"本该发出的时刻"算起，服务变慢时排队等待也会算进去
+
+三种客户端模式：
+    sync    每次 requests.get（每个请求新建连接，和最早的脚本一样）
+    pooled  所有并发共用一个带连接池的 APIClient
+    async   asyncio 控制并发，请求交给 APIClient 在线程池里执行（和 async_fetch 一样）
+
+不传 --url 时自动启动本地 mock_server，完全离线：
+    python load_test.py --mode all --workers 20 --requests 2000
+    python load_test.py --mode pooled --rps 300 --duration 10 --latency 0.02 --error-rate 0.05
+    python load_test.py --url http://127.0.0.1:8000 --mix "/random_joke=3,/posts/1=1" --proxy http://127.0.0.1:8080
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from api_client import APIClient
+from mock_server import MockServer
+
+MODES = ('sync', 'pooled', 'async')
+DEFAULT_MIX = '/random_joke=3,/posts/1=2,/api/=1,/json/=1,/users/torvalds=1,/ip=1'
+
+
+def parse_mix(text):
+    """'/a=3,/b=1' -> [('/a', 3), ('/b', 1)]；格式不对、路径为空或权重不是正数时抛 ValueError"""
+    mix = []
+    for part in text.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        path, _, weight = part.partition('=')
+        path = path.strip()
+        if not path:
+            raise ValueError(f'{part!r} 缺少路径')
+        try:
+            weight = float(weight) if weight.strip() else 1.0
+        except ValueError:
+            raise ValueError(f'{part!r} 的权重不是数字') from None
+        if not 0 < weight < float('inf'):
+            raise ValueError(f'{part!r} 的权重必须是正数')
+        mix.append((path, weight))
+    if not mix:
+        raise ValueError('不能为空')
+    return mix
+
+
+def build_sequence(mix, length=1000, seed=0):
+    """按权重生成一个固定的路径序列，第 i 个请求用 sequence[i % length]（每次运行都一样）"""
+    rng = random.Random(seed)
+    paths = [path for path, _ in mix]
+    weights = [weight for _, weight in mix]
+    return rng.choices(paths, weights=weights, k=length)
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+class Recorder:
+    """收集每个请求的结果（线程安全）"""
+
+    def __init__(self):
+        self.latencies = []
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def add(self, latency, error=None):
+        with self._lock:
+            self.latencies.append(latency)
+            if error is not None:
+                self.errors[error] = self.errors.get(error, 0) + 1
+
+    def report(self, mode, elapsed):
+        total = len(self.latencies)
+        failed = sum(self.errors.values())
+        result = {
+            'mode': mode,
+            'requests': total,
+            'elapsed': elapsed,
+            'throughput': total / elapsed if elapsed else 0.0,
+            'error_rate': failed / total if total else 0.0,
+            'errors': dict(self.errors),
+        }
+        if total:
+            for p in (50, 90, 99):
+                result[f'p{p}'] = percentile(self.latencies, p)
+            result['max'] = max(self.latencies)
+        return result
+
+
+def _classify(send):
+    """执行一次请求，返回错误类型（成功时 None）"""
+    try:
+        status = send()
+    except requests.Timeout:
+        return 'timeout'
+    except requests.ConnectionError:
+        return 'connection'
+    except Exception as e:
+        return type(e).__name__
+    return None if status < 400 else f'http_{status}'
+
+
+def make_sender(mode, base_url, proxies, timeout, workers):
+    """返回 (send(path) -> 状态码, close)"""
+    if mode == 'sync':
+        def send(path):
+            return requests.get(base_url + path, proxies=proxies, timeout=timeout,
+                                verify=False).status_code
+        return send, lambda: None
+
+    client = APIClient(proxies=proxies, timeout=timeout, verify=False, pool_maxsize=workers)
+
+    def send(path):
+        return client.get(base_url + path).status_code
+    return send, client.close
+
+
+# ============ 线程模式（sync / pooled）============
+
+def run_threads(send, sequence, recorder, workers, total, duration, rps):
+    deadline = time.perf_counter() + duration if duration else None
+    counter = iter(range(total if total else 1 << 62))
+    counter_lock = threading.Lock()
+
+    def next_index():
+        with counter_lock:
+            index = next(counter, None)
+        if index is None or (deadline and time.perf_counter() >= deadline):
+            return None
+        return index
+
+    def one(index, scheduled):
+        error = _classify(lambda: send(sequence[index % len(sequence)]))
+        recorder.add(time.perf_counter() - scheduled, error)
+
+    if rps is None:
+        # 闭环：每个线程发完一个马上发下一个
+        def worker():
+            while True:
+                index = next_index()
+                if index is None:
+                    return
+                one(index, time.perf_counter())
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return
+
+    # 开环：按计划时间提交，线程池满了就排队，排队时间也算进延迟
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for index in range(total if total else 1 << 62):
+            scheduled = start + index / rps
+            if deadline and scheduled >= deadline:
+                break
+            wait = scheduled - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            executor.submit(one, index, scheduled)
+
+
+# ============ asyncio 模式 ============
+
+async def run_async(send, sequence, recorder, workers, total, duration, rps):
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=workers)
+    semaphore = asyncio.Semaphore(workers)
+    start = time.perf_counter()
+    deadline = start + duration if duration else None
+    limit = total if total else 1 << 62
+
+    async def one(index, scheduled):
+        async with semaphore:
+            path = sequence[index % len(sequence)]
+            error = await loop.run_in_executor(executor, _classify, lambda: send(path))
+        recorder.add(time.perf_counter() - scheduled, error)
+
+    try:
+        if rps is None:
+            next_index = iter(range(limit))
+
+            async def worker():
+                for index in next_index:  # 所有协程共用一个迭代器，每个序号只用一次
+                    if deadline and time.perf_counter() >= deadline:
+                        return
+                    await one(index, time.perf_counter())
+
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        else:
+            tasks = []
+            for index in range(limit):
+                scheduled = start + index / rps
+                if deadline and scheduled >= deadline:
+                    break
+                wait = scheduled - time.perf_counter()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                tasks.append(asyncio.ensure_future(one(index, scheduled)))
+            await asyncio.gather(*tasks)
+    finally:
+        executor.shutdown(wait=False)
+
+
+def run_mode(mode, base_url, sequence, workers=10, total=1000, duration=None, rps=None,
+             proxies=None, timeout=10):
+    """跑一种模式，返回统计结果（延迟单位秒）"""
+    send, close = make_sender(mode, base_url, proxies, timeout, workers)
+    recorder = Recorder()
+    start = time.perf_counter()
+    try:
+        if mode == 'async':
+            asyncio.run(run_async(send, sequence, recorder, workers, total, duration, rps))
+        else:
+            run_threads(send, sequence, recorder, workers, total, duration, rps)
+    finally:
+        close()
+    return recorder.report(mode, time.perf_counter() - start)
+
+
+def print_results(results):
+    print("=" * 78)
+    print(f"{'模式':<8} {'请求数':>7} {'请求/秒':>9} {'错误率':>7}"
+          f" {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    print("=" * 78)
+    for r in results:
+        line = f"{r['mode']:<8} {r['requests']:>7} {r['throughput']:>9.0f} {r['error_rate']:>7.1%}"
+        if r['requests']:
+            line += ''.join(f" {r[k] * 1000:>8.1f}" for k in ('p50', 'p90', 'p99', 'max'))
+        print(line)
+        if r['errors']:
+            print(f"         错误: {r['errors']}")
+    print("=" * 78)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='请求路径压测工具')
+    parser.add_argument('--url', help='被测服务的地址，不传时自动启动本地 mock_server')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='请求组合，格式 "/路径=权重,..."')
+    parser.add_argument('--mode', default='all', choices=MODES + ('all',))
+    parser.add_argument('--workers', type=int, default=10, help='并发数（开环时是最大并发）')
+    parser.add_argument('--requests', type=int, default=1000, help='每种模式发多少个请求')
+    parser.add_argument('--duration', type=float, help='每种模式跑多少秒（设置后忽略 --requests）')
+    parser.add_argument('--rps', type=float, help='开环：每秒发多少个请求；不传就是闭环')
+    parser.add_argument('--proxy', help='代理地址，比如 http://127.0.0.1:8080')
+    parser.add_argument('--timeout', type=float, default=10)
+    parser.add_argument('--latency', type=float, default=0.01, help='mock_server 的服务端延迟（秒）')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='mock_server 的错误注入比例')
+    parser.add_argument('--json', help='把结果另存为JSON文件')
+    args = parser.parse_args(argv)
+    if args.requests < 1:
+        parser.error('--requests 至少是 1')
+    if args.duration is not None and args.duration <= 0:
+        parser.error('--duration 必须大于 0')
+    if args.workers < 1:
+        parser.error('--workers 至少是 1')
+    if args.rps is not None and args.rps <= 0:
+        parser.error('--rps 必须大于 0')
+    if args.timeout <= 0:
+        parser.error('--timeout 必须大于 0')
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(f'--mix {e}')
+
+    modes = MODES if args.mode == 'all' else (args.mode,)
+    sequence = build_sequence(mix)
+    proxies = {'http': args.proxy, 'https': args.proxy} if args.proxy else None
+    total = None if args.duration else args.requests
+
+    mock = None
+    if args.url is None:
+        mock = MockServer(latency=args.latency, error_rate=args.error_rate).start()
+    base_url = (args.url or mock.url).rstrip('/')
+
+    loop_kind = f"开环 {args.rps:g} 请求/秒" if args.rps else f"闭环 {args.workers} 并发"
+    amount = f"{args.duration:g} 秒" if args.duration else f"{args.requests} 个请求"
+    print(f"🎯 {base_url}  {loop_kind}，每种模式 {amount}")
+
+    try:
+        results = [run_mode(mode, base_url, sequence, args.workers, total, args.duration,
+                            args.rps, proxies, args.timeout)
+                   for mode in modes]
+    finally:
+        if mock is not None:
+            mock.stop()
+
+    print_results(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 结果已保存到 {args.json}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+本地HTTP测试服务器
+给性能测试用：在 127.0.0.1 上起一个支持 keep-alive 的小服务器，
+按路径返回JSON，不依赖外网
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def default_route(path, query, headers):
+    """默认路由：把请求路径和参数原样返回"""
+    return 200, {'path': path, 'query': query}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # 支持 keep-alive
+    disable_nagle_algorithm = True  # 响应头和正文分两次写，不关 Nagle 会多等 40ms
+
+    def setup(self):
+        super().setup()
+        # 模拟每条新连接的握手开销（TLS / 代理隧道）
+        self.server.connection_count += 1
+        if self.server.handshake_delay:
+            time.sleep(self.server.handshake_delay)
+
+    def do_GET(self):
+        self.server.request_count += 1
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        route = self.server.routes.get(parts.path, self.server.default_route)
+        result = route(parts.path, query, self.headers)
+        status, data = result[0], result[1]
+        response_headers = result[2] if len(result) > 2 else {}
+
+        if self.server.response_delay:
+            time.sleep(self.server.response_delay)
+
+        if status == 304:
+            body = b''
+        elif isinstance(data, bytes):
+            body = data
+        else:
+            body = json.dumps(data).encode('utf-8')
+        self.server.bytes_sent += len(body)
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in response_headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        bandwidth = self.server.bandwidth
+        if not bandwidth:
+            self.wfile.write(body)
+            return
+        # 限速：分块写，每块之后按带宽等一会儿，模拟慢网络下的大响应
+        for start in range(0, len(body), _CHUNK_SIZE):
+            chunk = body[start:start + _CHUNK_SIZE]
+            self.wfile.write(chunk)
+            time.sleep(len(chunk) / bandwidth)
+
+    def log_message(self, format, *args):
+        pass  # 不打印访问日志
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # 默认只有5，并发一高就会丢连接
+
+    def handle_error(self, request, client_address):
+        # 客户端超时先断开了连接，属于正常情况，不打印异常
+        if isinstance(sys.exc_info()[1], ConnectionError):
+            return
+        super().handle_error(request, client_address)
+
+
+class LocalServer:
+    """
+    本地测试服务器（用 with 语句启动和关闭）
+
+    routes: {路径: 函数(path, query, headers) -> (状态码, 数据[, 响应头])}
+    handshake_delay: 每条新连接额外等待的秒数
+    response_delay: 每个请求额外等待的秒数
+    bandwidth: 每秒最多发多少字节的正文（0 表示不限速）
+    """
+
+    def __init__(self, routes=None, handshake_delay=0, response_delay=0,
+                 default=default_route, bandwidth=0):
+        self.server = _Server(('127.0.0.1', 0), _Handler)
+        self.server.routes = dict(routes or {})
+        self.server.default_route = default
+        self.server.handshake_delay = handshake_delay
+        self.server.response_delay = response_delay
+        self.server.bandwidth = bandwidth
+        self.server.connection_count = 0
+        self.server.request_count = 0
+        self.server.bytes_sent = 0
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def connection_count(self):
+        return self.server.connection_count
+
+    @property
+    def request_count(self):
+        return self.server.request_count
+
+    @property
+    def bytes_sent(self):
+        return self.server.bytes_sent
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
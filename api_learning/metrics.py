@@ -0,0 +1,235 @@
+"""
+请求分阶段计时 + 延迟直方图
+response.elapsed 只是一个总数，分不清慢在 DNS、建连接、代理隧道、TLS 握手还是服务器本身。
+TimingAdapter 换掉 urllib3 的连接类，在每个阶段前后记时间：
+
+    dns            域名解析
+    connect        TCP 连接（走代理时是连到代理）
+    proxy_connect  HTTPS 走代理时的 CONNECT 隧道
+    tls            TLS 握手
+    ttfb           发出请求到收到响应头（服务器处理时间 + 一个来回）
+    download       读完响应正文
+
+复用连接时没有前四个阶段。每个阶段按主机记进对数分桶的直方图（HDR 风格，误差按比例固定），
+最后可以打印 p50/p90/p99，或者写成 Prometheus 文本格式的文件。
+"""
+
+import math
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+PHASES = ('dns', 'connect', 'proxy_connect', 'tls', 'ttfb', 'download', 'total')
+QUANTILES = (0.5, 0.9, 0.99)
+
+# 当前线程正在进行的请求的计时记录；连接类在这里面填各个阶段
+_local = threading.local()
+
+
+def _record(phase, seconds):
+    record = getattr(_local, 'record', None)
+    if record is not None:
+        record[phase] = record.get(phase, 0.0) + seconds
+
+
+class _TimingMixin:
+    def _new_conn(self):
+        # 自己先解析域名（单独计时），再把解析出的IP逐个交给 urllib3 去连
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror:
+            return super()._new_conn()  # 让 urllib3 抛它自己的 NameResolutionError
+        resolved = time.perf_counter()
+        _record('dns', resolved - start)
+
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        try:
+            for i, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    sock = super()._new_conn()
+                    break
+                except NewConnectionError:
+                    if i == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = host
+            _record('connect', time.perf_counter() - resolved)
+        return sock
+
+    def _tunnel(self):
+        start = time.perf_counter()
+        try:
+            return super()._tunnel()
+        finally:
+            _record('proxy_connect', time.perf_counter() - start)
+
+
+class TimingHTTPConnection(_TimingMixin, HTTPConnection):
+    pass
+
+
+class TimingHTTPSConnection(_TimingMixin, HTTPSConnection):
+    def connect(self):
+        # TLS 握手没有单独的方法可以包，用整个 connect 的时间减去前面几个阶段
+        record = getattr(_local, 'record', None)
+        before = sum(record.get(p, 0.0) for p in ('dns', 'connect', 'proxy_connect')) if record else 0
+        start = time.perf_counter()
+        super().connect()
+        if record is not None:
+            after = sum(record.get(p, 0.0) for p in ('dns', 'connect', 'proxy_connect'))
+            _record('tls', max(0.0, time.perf_counter() - start - (after - before)))
+
+
+class _TimingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimingHTTPConnection
+
+
+class _TimingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimingHTTPSConnection
+
+
+_POOL_CLASSES = {'http': _TimingHTTPConnectionPool, 'https': _TimingHTTPSConnectionPool}
+
+
+class LogHistogram:
+    """
+    对数分桶直方图：第 i 个桶覆盖 [min_value * growth^i, min_value * growth^(i+1))
+    分位数的相对误差不超过 growth - 1，占用内存只和数值跨度有关，和样本数无关
+    """
+
+    def __init__(self, min_value=1e-6, growth=1.05):
+        self.min_value = min_value
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.buckets = {}
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        index = max(0, int(math.log(max(value, self.min_value) / self.min_value) / self._log_growth))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """第 q 分位数（取所在桶的中点），没有数据时返回 None"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                low = self.min_value * self.growth ** index
+                return min(self.max, low * (1 + self.growth) / 2)
+        return self.max
+
+
+class RequestMetrics:
+    """按 (主机, 阶段) 汇总的计时直方图（线程安全）"""
+
+    def __init__(self, growth=1.05):
+        self.growth = growth
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, host, timings):
+        with self._lock:
+            for phase, seconds in timings.items():
+                key = (host, phase)
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = self._histograms[key] = LogHistogram(growth=self.growth)
+                histogram.add(seconds)
+
+    def summary(self):
+        """{主机: {阶段: {'count', 'mean', 'p50', 'p90', 'p99', 'max'}}}，单位秒"""
+        with self._lock:
+            result = {}
+            for (host, phase), h in sorted(self._histograms.items(),
+                                           key=lambda item: (item[0][0], PHASES.index(item[0][1]))):
+                stats = {'count': h.count, 'mean': h.sum / h.count, 'max': h.max}
+                for q in QUANTILES:
+                    stats[f'p{q * 100:g}'] = h.quantile(q)
+                result.setdefault(host, {})[phase] = stats
+            return result
+
+    def print_summary(self):
+        print(f"{'主机':<28} {'阶段':<14} {'次数':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}")
+        for host, phases in self.summary().items():
+            for phase, s in phases.items():
+                print(f"{host:<28} {phase:<14} {s['count']:>6}"
+                      + ''.join(f" {s[k] * 1000:>7.1f}ms" for k in ('p50', 'p90', 'p99', 'max')))
+
+    def to_prometheus(self, name='http_request_phase_seconds'):
+        """Prometheus 文本格式（summary 类型）"""
+        lines = [f'# HELP {name} HTTP request time by phase.', f'# TYPE {name} summary']
+        for host, phases in self.summary().items():
+            for phase, s in phases.items():
+                labels = f'host="{host}",phase="{phase}"'
+                for q in QUANTILES:
+                    lines.append(f'{name}{{{labels},quantile="{q:g}"}} {s[f"p{q * 100:g}"]:.6f}')
+                lines.append(f'{name}_sum{{{labels}}} {s["mean"] * s["count"]:.6f}')
+                lines.append(f'{name}_count{{{labels}}} {s["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path, name='http_request_phase_seconds'):
+        """写到文件（比如给 node_exporter 的 textfile collector 读）"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus(name))
+        os.replace(tmp_path, path)
+
+
+class TimingAdapter(HTTPAdapter):
+    """
+    记录每个请求各阶段耗时的 HTTPAdapter
+    计时结果放在 response.timings（秒），同时汇总进 metrics
+    SOCKS 代理的连接由 PySocks 建立，只记 ttfb / download / total
+    """
+
+    def __init__(self, metrics, **kwargs):
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _POOL_CLASSES
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        if not proxy.lower().startswith('socks'):
+            manager.pool_classes_by_scheme = _POOL_CLASSES
+        return manager
+
+    def send(self, request, stream=False, **kwargs):
+        record = _local.record = {}
+        start = time.perf_counter()
+        try:
+            response = super().send(request, stream=stream, **kwargs)
+            headers_at = time.perf_counter()
+            setup = sum(record.get(p, 0.0) for p in ('dns', 'connect', 'proxy_connect', 'tls'))
+            record['ttfb'] = max(0.0, headers_at - start - setup)
+            if not stream:
+                response.content  # 在这里读完正文，才能把下载时间单独算出来
+                record['download'] = time.perf_counter() - headers_at
+            record['total'] = time.perf_counter() - start
+        finally:
+            _local.record = None
+
+        response.timings = record
+        self.metrics.observe(urlsplit(request.url).hostname or '', record)
+        return response
@@ -0,0 +1,438 @@
+"""
+本地模拟API + 代理服务器（asyncio）
+没有外网时也能测并发和代理路径的性能：
+  - API：返回和脚本里用到的接口一样结构的JSON（笑话、文章、随机用户、IP信息、GitHub用户……）
+  - HTTP 代理：支持 CONNECT 隧道，也支持普通的转发（GET http://...）
+  - SOCKS5 代理：不需要认证，支持 IPv4 / 域名 / IPv6 地址
+可以注入延迟、随机错误和带宽限制。
+
+在代码里用 with 语句启动（在后台线程里跑事件循环）：
+    with MockServer(latency=0.02, error_rate=0.1) as mock:
+        requests.get(mock.url + '/random_joke', proxies=mock.http_proxies)
+
+也可以在命令行单独运行：
+    python mock_server.py --port 8000 --http-proxy-port 8080 --socks-port 1080 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import ipaddress
+import json
+import random
+import re
+import socket
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+_CHUNK_SIZE = 16 * 1024
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error',
+            502: 'Bad Gateway', 503: 'Service Unavailable'}
+
+_JOKES = [
+    ('general', "Why don't skeletons fight each other?", "They don't have the guts."),
+    ('programming', 'Why do programmers prefer dark mode?', 'Because light attracts bugs.'),
+    ('programming', 'How many programmers does it take to change a light bulb?',
+     "None, that's a hardware problem."),
+    ('programming', 'Why did the developer go broke?', 'Because he used up all his cache.'),
+]
+_FIRST_NAMES = ['Emma', 'Liam', 'Olivia', 'Noah', 'Mia', 'Lucas', 'Wei', 'Yuki']
+_LAST_NAMES = ['Smith', 'Garcia', 'Müller', 'Wang', 'Tanaka', 'Silva']
+_CITIES = [('Tokyo', 'Japan'), ('Berlin', 'Germany'), ('Shanghai', 'China'), ('Austin', 'United States')]
+
+
+def _joke(rng):
+    joke_id = rng.randint(1, 400)
+    kind, setup, punchline = _JOKES[joke_id % len(_JOKES)]
+    return {'type': kind, 'setup': setup, 'punchline': punchline, 'id': joke_id}
+
+
+def _post(post_id):
+    return {
+        'userId': (post_id - 1) // 10 + 1,
+        'id': post_id,
+        'title': f'post {post_id} sunt aut facere repellat provident',
+        'body': 'quia et suscipit\nsuscipit recusandae consequuntur expedita et cum',
+    }
+
+
+def _random_user(rng):
+    first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+    city, country = rng.choice(_CITIES)
+    return {
+        'results': [{
+            'gender': rng.choice(['female', 'male']),
+            'name': {'title': 'Mx', 'first': first, 'last': last},
+            'location': {'city': city, 'country': country},
+            'email': f'{first.lower()}.{last.lower()}@example.com',
+        }],
+        'info': {'seed': f'{rng.getrandbits(32):08x}', 'results': 1, 'page': 1, 'version': '1.4'},
+    }
+
+
+def _ip_info(client_ip):
+    return {'ip': client_ip, 'city': 'Localhost', 'region': 'Loopback',
+            'country_name': 'Local Network', 'org': 'AS0 Mock Server'}
+
+
+def _positive_int(query, name, default):
+    """查询参数里的正整数；不是正整数时抛 ValueError"""
+    value = int(query.get(name, default))
+    if value < 1:
+        raise ValueError(f'{name} must be >= 1')
+    return value
+
+
+def _github_user(name):
+    return {'login': name, 'id': sum(map(ord, name)), 'name': name.title(),
+            'bio': None, 'followers': 1000, 'public_repos': 10}
+
+
+class MockServer:
+    """
+    port / http_proxy_port / socks_port: 监听端口，0 表示随机挑一个空闲端口，None 表示不启动
+    latency: API 每个请求额外等待的秒数；jitter: 随机浮动比例
+    error_rate: 随机返回 503 的比例
+    bandwidth: API 响应正文每秒最多发多少字节（0 不限速）
+    tunnel_delay: 代理每建立一条隧道额外等待的秒数（模拟代理自己的握手开销）
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, http_proxy_port=0, socks_port=0, latency=0.0,
+                 jitter=0.0, error_rate=0.0, bandwidth=0, tunnel_delay=0.0, seed=0):
+        self.host = host
+        self.ports = {'api': port, 'http_proxy': http_proxy_port, 'socks': socks_port}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.bandwidth = bandwidth
+        self.tunnel_delay = tunnel_delay
+        self.request_count = 0
+        self.error_count = 0
+        self.tunnel_count = 0
+        self._rng = random.Random(seed)
+        self._servers = []
+        self._loop = None
+        self._thread = None
+
+    # ============ 地址 ============
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.ports["api"]}'
+
+    @property
+    def http_proxies(self):
+        address = f'http://{self.host}:{self.ports["http_proxy"]}'
+        return {'http': address, 'https': address}
+
+    @property
+    def socks_proxies(self):
+        address = f'socks5h://{self.host}:{self.ports["socks"]}'
+        return {'http': address, 'https': address}
+
+    # ============ API ============
+
+    def route(self, path, query, client_ip):
+        """按路径返回 (状态码, 数据, 额外响应头)"""
+        rng = self._rng
+        if path == '/random_joke':
+            return 200, _joke(rng), {}
+        if path == '/jokes/programming/random':
+            return 200, [_joke(rng)], {}
+        if path == '/posts':
+            posts = [_post(i) for i in range(1, 101)]
+            if 'userId' in query:
+                posts = [p for p in posts if str(p['userId']) == query['userId']]
+            if '_page' in query:
+                try:
+                    limit = _positive_int(query, '_limit', 10)
+                    start = (_positive_int(query, '_page', 1) - 1) * limit
+                except ValueError as e:
+                    return 400, {'error': 'bad query', 'detail': str(e)}, {}
+                posts = posts[start:start + limit]
+            return 200, posts, {}
+        match = re.fullmatch(r'/posts/(\d+)', path)
+        if match and 1 <= int(match.group(1)) <= 100:
+            return 200, _post(int(match.group(1))), {}
+        if path == '/api/':
+            return 200, _random_user(rng), {}
+        if path == '/json/':
+            return 200, _ip_info(client_ip), {}
+        if path == '/ip':
+            return 200, {'origin': client_ip}, {}
+        if path == '/fact':
+            return 200, {'fact': 'Cats sleep for around 13 to 16 hours a day.', 'length': 44}, {}
+        match = re.fullmatch(r'/users/([\w-]+)', path)
+        if match:
+            reset = int(time.time()) + 3600
+            return 200, _github_user(match.group(1)), {
+                'X-RateLimit-Limit': '60', 'X-RateLimit-Remaining': '59',
+                'X-RateLimit-Reset': str(reset)}
+        return 404, {'error': 'not found', 'path': path}, {}
+
+    async def _handle_api(self, reader, writer):
+        client_ip = writer.get_extra_info('peername')[0]
+        try:
+            while True:
+                method, target, headers = await _read_request_head(reader)
+                length = int(headers.get('content-length', 0))
+                if length:
+                    await reader.readexactly(length)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, method, target, client_ip, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError,
+                ConnectionError, asyncio.CancelledError):
+            pass  # 客户端断开、请求格式不对，或者服务器正在停止
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, method, target, client_ip, keep_alive):
+        self.request_count += 1
+        parts = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        delay = self.latency
+        if self.jitter:
+            delay *= 1 + self._rng.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if method not in ('GET', 'HEAD'):
+            status, data, extra_headers = 405, {'error': 'method not allowed'}, {}
+        elif self.error_rate and self._rng.random() < self.error_rate:
+            self.error_count += 1
+            status, data, extra_headers = 503, {'error': 'injected failure'}, {'Retry-After': '0'}
+        else:
+            try:
+                status, data, extra_headers = self.route(parts.path, query, client_ip)
+            except Exception as e:
+                # 路由里的 bug 回 500，不要直接断开连接（客户端只会看到 RemoteDisconnected）
+                status, data, extra_headers = 500, {'error': 'internal error', 'detail': repr(e)}, {}
+
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        head = [f'HTTP/1.1 {status} {_REASONS.get(status, "")}',
+                'Content-Type: application/json; charset=utf-8',
+                f'Content-Length: {len(body)}',
+                'Connection: ' + ('keep-alive' if keep_alive else 'close')]
+        head += [f'{name}: {value}' for name, value in extra_headers.items()]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+        if method == 'HEAD':
+            body = b''
+
+        if not self.bandwidth:
+            writer.write(body)
+            await writer.drain()
+            return
+        for start in range(0, len(body), _CHUNK_SIZE):
+            chunk = body[start:start + _CHUNK_SIZE]
+            writer.write(chunk)
+            await writer.drain()
+            await asyncio.sleep(len(chunk) / self.bandwidth)
+
+    # ============ HTTP 代理 ============
+
+    async def _handle_http_proxy(self, reader, writer):
+        try:
+            method, target, headers = await _read_request_head(reader)
+            if method == 'CONNECT':
+                host, _, port = target.rpartition(':')
+                upstream = await self._open_tunnel(host.strip('[]'), int(port))
+                if upstream is None:
+                    writer.write(b'HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\n\r\n')
+                    await writer.drain()
+                    return
+                writer.write(b'HTTP/1.1 200 Connection Established\r\n\r\n')
+                await writer.drain()
+                await _relay(reader, writer, *upstream)
+                return
+
+            # 普通转发：GET http://host:port/path，改写成 GET /path 发给目标服务器
+            parts = urlsplit(target)
+            if parts.scheme != 'http' or not parts.hostname:
+                writer.write(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n')
+                await writer.drain()
+                return
+            upstream = await self._open_tunnel(parts.hostname, parts.port or 80)
+            if upstream is None:
+                writer.write(b'HTTP/1.1 502 Bad Gateway\r\nContent-Length: 0\r\n\r\n')
+                await writer.drain()
+                return
+            path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+            lines = [f'{method} {path} HTTP/1.1']
+            lines += [f'{name}: {value}' for name, value in headers.items()
+                      if not name.startswith('proxy-') and name != 'connection']
+            # 每条转发连接只处理一个请求，响应完就关闭（客户端会自动重连）
+            lines.append('Connection: close')
+            upstream[1].write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+            await _relay(reader, writer, *upstream)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError,
+                ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _open_tunnel(self, host, port):
+        self.tunnel_count += 1
+        if self.tunnel_delay:
+            await asyncio.sleep(self.tunnel_delay)
+        try:
+            return await asyncio.open_connection(host, port)
+        except OSError:
+            return None
+
+    # ============ SOCKS5 代理 ============
+
+    async def _handle_socks(self, reader, writer):
+        try:
+            version, method_count = await reader.readexactly(2)
+            methods = await reader.readexactly(method_count)
+            if version != 5 or 0 not in methods:
+                writer.write(b'\x05\xff')  # 只支持"不需要认证"
+                await writer.drain()
+                return
+            writer.write(b'\x05\x00')
+
+            version, command, _, address_type = await reader.readexactly(4)
+            if address_type == 1:
+                host = socket.inet_ntop(socket.AF_INET, await reader.readexactly(4))
+            elif address_type == 3:
+                host = (await reader.readexactly((await reader.readexactly(1))[0])).decode('idna')
+            elif address_type == 4:
+                host = socket.inet_ntop(socket.AF_INET6, await reader.readexactly(16))
+            else:
+                writer.write(b'\x05\x08\x00\x01' + bytes(6))  # 不支持的地址类型
+                return
+            port = int.from_bytes(await reader.readexactly(2), 'big')
+
+            if command != 1:
+                writer.write(b'\x05\x07\x00\x01' + bytes(6))  # 只支持 CONNECT
+                return
+            upstream = await self._open_tunnel(host, port)
+            if upstream is None:
+                writer.write(b'\x05\x05\x00\x01' + bytes(6))  # 连接被拒绝
+                return
+
+            bound_host, bound_port = upstream[1].get_extra_info('sockname')[:2]
+            bound = ipaddress.ip_address(bound_host)
+            writer.write(bytes([5, 0, 0, 1 if bound.version == 4 else 4]) + bound.packed
+                         + bound_port.to_bytes(2, 'big'))
+            await writer.drain()
+            await _relay(reader, writer, *upstream)
+        except (asyncio.IncompleteReadError, ConnectionError, UnicodeError,
+                asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    # ============ 启动 / 停止 ============
+
+    async def _start_servers(self):
+        handlers = {'api': self._handle_api, 'http_proxy': self._handle_http_proxy,
+                    'socks': self._handle_socks}
+        for name, handler in handlers.items():
+            if self.ports[name] is None:
+                continue
+            server = await asyncio.start_server(handler, self.host, self.ports[name], backlog=512)
+            self.ports[name] = server.sockets[0].getsockname()[1]
+            self._servers.append(server)
+
+    async def serve_forever(self, on_ready=None):
+        """在当前事件循环里一直运行（命令行模式用）；端口监听好后调用 on_ready(self)"""
+        await self._start_servers()
+        if on_ready is not None:
+            on_ready(self)
+        await asyncio.gather(*(server.serve_forever() for server in self._servers))
+
+    def start(self):
+        """在后台线程里启动事件循环，端口都监听好了才返回"""
+        self._loop = asyncio.new_event_loop()
+        self._loop.run_until_complete(self._start_servers())
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        loop = self._loop
+
+        async def shutdown():
+            for server in self._servers:
+                server.close()
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+async def _read_request_head(reader):
+    """读请求行和请求头，返回 (方法, 目标, {小写头名: 值})"""
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    method, target, _ = lines[0].split(' ', 2)
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    return method, target, headers
+
+
+async def _pipe(reader, writer):
+    try:
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def _relay(client_reader, client_writer, upstream_reader, upstream_writer):
+    """双向转发，直到有一边关闭连接"""
+    await asyncio.gather(_pipe(client_reader, upstream_writer),
+                         _pipe(upstream_reader, client_writer))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='本地模拟API + HTTP/SOCKS5 代理')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000, help='API 端口')
+    parser.add_argument('--http-proxy-port', type=int, default=8080, help='HTTP 代理端口')
+    parser.add_argument('--socks-port', type=int, default=1080, help='SOCKS5 代理端口')
+    parser.add_argument('--latency', type=float, default=0.0, help='每个API请求额外延迟（秒）')
+    parser.add_argument('--jitter', type=float, default=0.0, help='延迟随机浮动比例')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='随机返回 503 的比例')
+    parser.add_argument('--bandwidth', type=int, default=0, help='响应正文限速（字节/秒）')
+    parser.add_argument('--tunnel-delay', type=float, default=0.0, help='代理建隧道额外延迟（秒）')
+    args = parser.parse_args()
+
+    mock = MockServer(args.host, args.port, args.http_proxy_port, args.socks_port,
+                      latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                      bandwidth=args.bandwidth, tunnel_delay=args.tunnel_delay)
+
+    def print_addresses(server):
+        print(f"🌐 API:        {server.url}  (/random_joke /posts/1 /api/ /json/ /users/torvalds /ip)")
+        print(f"🔀 HTTP 代理:  {server.http_proxies['http']}")
+        print(f"🧦 SOCKS5 代理: {server.socks_proxies['http']}")
+        print("按 Ctrl+C 停止")
+
+    try:
+        asyncio.run(mock.serve_forever(on_ready=print_addresses))
+    except KeyboardInterrupt:
+        pass
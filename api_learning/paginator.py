@@ -0,0 +1,153 @@
+"""
+分页迭代器
+列表接口一次只返回一页，要拿全部数据得一页页往下翻。常见的翻页方式有三种：
+  - 页码 / 偏移量：?page=2&per_page=50 或 ?offset=100&limit=50
+  - 游标：响应里带 next_cursor，下一页把它原样传回去
+  - Link 响应头（GitHub）：Link: <https://...&page=3>; rel="next"
+paginate() 把它们统一成一个生成器，逐个 yield 列表里的元素；
+拿到一页后马上在后台线程请求下一页，调用方处理当前页的同时下一页已经在路上了。
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from json_backend import response_json
+
+
+def _lookup(data, path):
+    """按 'a.b.c' 取嵌套字典里的值，中途缺了返回 None"""
+    for key in path.split('.'):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+class _PageStyle:
+    """
+    翻页方式的基类
+    items_key: 列表在响应JSON里的位置（比如 'data' 或 'items'），None 表示响应本身就是列表
+    """
+
+    def __init__(self, items_key=None):
+        self.items_key = items_key
+
+    def items(self, data):
+        items = data if self.items_key is None else _lookup(data, self.items_key)
+        return items or []
+
+    def first(self, params):
+        """第一页的查询参数"""
+        return dict(params)
+
+    def next_request(self, url, params, response, data, items):
+        """根据当前页算出下一页的 (url, params)，没有下一页返回 None"""
+        raise NotImplementedError
+
+
+class PageNumber(_PageStyle):
+    """页码分页：拿到的元素不满一页就说明是最后一页"""
+
+    def __init__(self, page_param='page', size_param='per_page', page_size=50, start=1,
+                 items_key=None):
+        super().__init__(items_key)
+        self.page_param = page_param
+        self.size_param = size_param
+        self.page_size = page_size
+        self.start = start
+
+    def first(self, params):
+        return dict(params, **{self.page_param: self.start, self.size_param: self.page_size})
+
+    def next_request(self, url, params, response, data, items):
+        if len(items) < self.page_size:
+            return None
+        return url, dict(params, **{self.page_param: params[self.page_param] + 1})
+
+
+class Offset(_PageStyle):
+    """偏移量分页：下一页从 offset + 本页条数 开始"""
+
+    def __init__(self, offset_param='offset', limit_param='limit', page_size=50,
+                 items_key=None):
+        super().__init__(items_key)
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.page_size = page_size
+
+    def first(self, params):
+        return dict(params, **{self.offset_param: 0, self.limit_param: self.page_size})
+
+    def next_request(self, url, params, response, data, items):
+        if len(items) < self.page_size:
+            return None
+        return url, dict(params, **{self.offset_param: params[self.offset_param] + len(items)})
+
+
+class Cursor(_PageStyle):
+    """
+    游标分页
+    cursor_key: 下一页游标在响应JSON里的位置（比如 'meta.next_cursor'），为空表示没有下一页
+    """
+
+    def __init__(self, cursor_param='cursor', cursor_key='next_cursor', items_key='data'):
+        super().__init__(items_key)
+        self.cursor_param = cursor_param
+        self.cursor_key = cursor_key
+
+    def next_request(self, url, params, response, data, items):
+        cursor = _lookup(data, self.cursor_key)
+        if not cursor:
+            return None
+        return url, dict(params, **{self.cursor_param: cursor})
+
+
+class LinkHeader(_PageStyle):
+    """Link 响应头分页（GitHub）：下一页的完整URL在 rel="next" 里，已经带好了参数"""
+
+    def next_request(self, url, params, response, data, items):
+        next_link = response.links.get('next')
+        if next_link is None:
+            return None
+        return next_link['url'], {}
+
+
+def paginate(client, url, style, params=None, prefetch=True, max_pages=None, **kwargs):
+    """
+    逐个 yield 所有页里的元素（生成器，不往下迭代就不会继续请求）
+
+    client: APIClient
+    style: PageNumber / Offset / Cursor / LinkHeader 实例
+    prefetch: 处理当前页时在后台线程提前请求下一页
+    max_pages: 最多请求多少页，None 表示翻到底
+    状态码不是 2xx 时抛 requests.HTTPError
+    """
+    def fetch(page_url, page_params):
+        response = client.get(page_url, params=page_params, **kwargs)
+        response.raise_for_status()
+        return response, response_json(response)
+
+    request = (url, style.first(params or {}))
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    pending = None
+    pages = 0
+    try:
+        while request is not None:
+            page_url, page_params = request
+            if pending is not None:
+                response, data = pending.result()
+            else:
+                response, data = fetch(page_url, page_params)
+            pages += 1
+
+            items = style.items(data)
+            request = style.next_request(page_url, page_params, response, data, items)
+            if max_pages is not None and pages >= max_pages:
+                request = None
+            pending = None
+            if executor is not None and request is not None:
+                pending = executor.submit(fetch, *request)
+
+            yield from items
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,145 @@
+"""
+代理发现结果缓存 + 后台健康检查
+把上次找到的可用代理（和检查时间）存到本地文件，下次启动时只发一个请求验证它，
+还能用就直接用；不能用了才退回到完整的端口扫描。
+ProxyHealthMonitor 可以在后台线程里定期重新检查，代理挂了自动重新发现。
+"""
+
+import json
+import os
+import threading
+import time
+
+from find_proxy import COMMON_PORTS, TEST_URL, find_open_ports, probe_proxies, validate_proxies
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.proxy_cache.json')
+PROBE_TIMEOUT = 2
+
+
+def load_cached_proxy(path=DEFAULT_CACHE_PATH):
+    """读取缓存的代理信息，没有或文件损坏时返回 None"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or not isinstance(data.get('config'), dict):
+        return None
+    return data
+
+
+def save_proxy(proxy, path=DEFAULT_CACHE_PATH):
+    """保存代理信息（至少要有 'config'），自动加上检查时间；返回保存的内容"""
+    record = dict(proxy, checked_at=time.time())
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(record, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)  # 先写临时文件再替换，写一半被打断也不会损坏旧缓存
+    return record
+
+
+def check_cached_proxy(path=DEFAULT_CACHE_PATH, timeout=PROBE_TIMEOUT, test_url=TEST_URL):
+    """用一次快速请求验证缓存的代理，可用时返回更新过延迟的代理信息，否则返回 None"""
+    cached = load_cached_proxy(path)
+    if cached is None:
+        return None
+
+    latency = probe_proxies(cached['config'], timeout, test_url)
+    if latency is None:
+        return None
+    cached['latency'] = latency
+    return save_proxy(cached, path)
+
+
+def full_scan(ports=COMMON_PORTS, test_url=TEST_URL):
+    """完整扫描：并发扫端口 + 并发验证协议，返回延迟最低的代理，找不到返回 None"""
+    working = validate_proxies(find_open_ports(ports), test_url=test_url)
+    return working[0] if working else None
+
+
+def discover_proxy(path=DEFAULT_CACHE_PATH, ports=COMMON_PORTS, timeout=PROBE_TIMEOUT,
+                   test_url=TEST_URL):
+    """先验证缓存的代理，不行再完整扫描并写入缓存；都找不到返回 None"""
+    cached = check_cached_proxy(path, timeout, test_url)
+    if cached is not None:
+        return cached
+
+    best = full_scan(ports, test_url)
+    if best is None:
+        return None
+    return save_proxy(best, path)
+
+
+class ProxyHealthMonitor:
+    """
+    后台定期检查代理是否可用（用 with 语句启动和停止）
+
+    interval: 每隔多少秒检查一次
+    on_change: 可用代理变了（包括变成 None）时调用 on_change(新的代理信息)
+    """
+
+    def __init__(self, interval=60, path=DEFAULT_CACHE_PATH, ports=COMMON_PORTS,
+                 timeout=PROBE_TIMEOUT, test_url=TEST_URL, on_change=None):
+        self.interval = interval
+        self.path = path
+        self.ports = ports
+        self.timeout = timeout
+        self.test_url = test_url
+        self.on_change = on_change
+        self.current = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def check(self):
+        """检查一次：当前代理还能用就只更新延迟，否则重新发现"""
+        current = self.current
+        if current is not None:
+            latency = probe_proxies(current['config'], self.timeout, self.test_url)
+            if latency is not None:
+                self.current = save_proxy(dict(current, latency=latency), self.path)
+                return self.current
+
+        found = discover_proxy(self.path, self.ports, self.timeout, self.test_url)
+        changed = (found or {}).get('config') != (current or {}).get('config')
+        self.current = found
+        if changed and self.on_change is not None:
+            self.on_change(found)
+        return found
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception:
+                pass  # 后台线程不能因为一次检查出错就退出
+
+    def start(self):
+        """先同步检查一次，再启动后台线程"""
+        self.check()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    proxy = discover_proxy()
+    print(f"耗时: {time.perf_counter() - start:.2f}秒")
+
+    if proxy:
+        print(f"✓ 可用代理: proxies = {proxy['config']} ({proxy['latency'] * 1000:.0f} ms)")
+    else:
+        print("✗ 没有找到可用的代理")
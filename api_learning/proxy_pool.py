@@ -0,0 +1,181 @@
+"""
+代理池 + 熔断器
+同时管理多个候选代理，记录每个代理的延迟和出错率，每次请求挑最健康的那个；
+某个代理连续失败几次就"熔断"（一段时间内不再用它），过了冷却时间再放一个请求去试探，
+成功了就恢复。这样一个快挂掉的代理不会让每个请求都白等满超时。
+"""
+
+import threading
+import time
+
+# V2RayN 可能的代理配置（test_v2ray.py 也用这份列表）
+V2RAY_CONFIGS = [
+    {
+        'name': 'SOCKS5 - 端口5001',
+        'proxies': {
+            'http': 'socks5://127.0.0.1:5001',
+            'https': 'socks5://127.0.0.1:5001',
+        }
+    },
+    {
+        'name': 'SOCKS5H - 端口5001 (DNS通过代理)',
+        'proxies': {
+            'http': 'socks5h://127.0.0.1:5001',
+            'https': 'socks5h://127.0.0.1:5001',
+        }
+    },
+    {
+        'name': 'HTTP - 端口10809',
+        'proxies': {
+            'http': 'http://127.0.0.1:10809',
+            'https': 'http://127.0.0.1:10809',
+        }
+    },
+    {
+        'name': 'HTTP - 端口10808',
+        'proxies': {
+            'http': 'http://127.0.0.1:10808',
+            'https': 'http://127.0.0.1:10808',
+        }
+    },
+]
+
+CLOSED = 'closed'        # 正常
+OPEN = 'open'            # 熔断中，不发请求
+HALF_OPEN = 'half_open'  # 冷却结束，放一个请求去试探
+
+
+class CircuitBreaker:
+    """
+    failure_threshold: 连续失败多少次后熔断
+    reset_timeout: 熔断多少秒后进入试探状态
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow(self, now):
+        """现在能不能用它发请求（试探状态下同一时间只放行一个请求）"""
+        if self.state == OPEN and now - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+            self._probing = False
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._probing:
+            return True
+        return False
+
+    def on_request(self):
+        if self.state == HALF_OPEN:
+            self._probing = True
+
+    def release(self):
+        """请求结束了但没有记成功/失败（比如抛了别的异常）：把试探名额还回去"""
+        self._probing = False
+
+    def on_success(self):
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._probing = False
+
+    def on_failure(self, now):
+        self.consecutive_failures += 1
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = now
+            self._probing = False
+
+
+class ProxyEndpoint:
+    """一个候选代理和它的健康数据"""
+
+    def __init__(self, name, proxies, breaker):
+        self.name = name
+        self.proxies = proxies
+        self.breaker = breaker
+        self.latency = None   # 延迟的指数移动平均（秒），还没用过时是 None
+        self.error_rate = 0.0  # 出错率的指数移动平均
+        self.successes = 0
+        self.failures = 0
+
+    def score(self, error_penalty):
+        # 分数越小越好，先比第一项：
+        #   0 测过延迟的：延迟 × (1 + 出错率惩罚)
+        #   1 还没用过的：排在测过的后面，按候选列表的顺序轮到它（不让一堆没开的备用代理抢在好用的前面）
+        #   2 用过但从来没成功过的：排到最后
+        if self.latency is None:
+            return (2, 0.0) if self.failures else (1, 0.0)
+        return (0, self.latency * (1 + error_penalty * self.error_rate))
+
+
+class ProxyPool:
+    """
+    线程安全的代理池
+
+    candidates: [{'name': 名字, 'proxies': requests 的 proxies 字典}, ...]，格式和 V2RAY_CONFIGS 一样
+    alpha: 指数移动平均的权重，越大越看重最近几次
+    error_penalty: 出错率对分数的影响
+    """
+
+    def __init__(self, candidates, failure_threshold=3, reset_timeout=30, alpha=0.3,
+                 error_penalty=10):
+        self.endpoints = [
+            ProxyEndpoint(c['name'], c['proxies'],
+                          CircuitBreaker(failure_threshold, reset_timeout))
+            for c in candidates
+        ]
+        self.alpha = alpha
+        self.error_penalty = error_penalty
+        self._lock = threading.Lock()
+
+    def choose(self):
+        """挑一个当前最健康、没有熔断的代理；全部熔断时返回 None"""
+        with self._lock:
+            now = time.monotonic()
+            available = [e for e in self.endpoints if e.breaker.allow(now)]
+            if not available:
+                return None
+            best = min(available, key=lambda e: e.score(self.error_penalty))
+            best.breaker.on_request()
+            return best
+
+    def record_success(self, endpoint, latency):
+        with self._lock:
+            a = self.alpha
+            endpoint.latency = latency if endpoint.latency is None else (
+                a * latency + (1 - a) * endpoint.latency)
+            endpoint.error_rate *= 1 - a
+            endpoint.successes += 1
+            endpoint.breaker.on_success()
+
+    def record_failure(self, endpoint):
+        with self._lock:
+            a = self.alpha
+            endpoint.error_rate = a + (1 - a) * endpoint.error_rate
+            endpoint.failures += 1
+            endpoint.breaker.on_failure(time.monotonic())
+
+    def release(self, endpoint):
+        """请求结束时调用（放在 finally 里）：没记成功/失败时也不会让代理一直卡在试探状态"""
+        with self._lock:
+            endpoint.breaker.release()
+
+    def stats(self):
+        """每个代理的状态、延迟、出错率和成功/失败次数"""
+        with self._lock:
+            return [
+                {
+                    'name': e.name,
+                    'state': e.breaker.state,
+                    'latency': e.latency,
+                    'error_rate': e.error_rate,
+                    'successes': e.successes,
+                    'failures': e.failures,
+                }
+                for e in self.endpoints
+            ]
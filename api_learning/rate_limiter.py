@@ -0,0 +1,147 @@
+"""
+客户端限流（每个主机一个令牌桶）
+令牌按固定速度往桶里加，每次请求拿走一个；桶空了就先等一会儿再发，
+而不是发出去吃一个 429 再重试。
+服务器返回 X-RateLimit-* 头（比如 GitHub）时，按剩余额度和重置时间自动调整速度。
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+from retry_policy import parse_retry_after
+
+
+class TokenBucket:
+    """
+    rate: 每秒补充多少个令牌
+    capacity: 桶的容量，也就是最多能连续突发多少个请求
+    """
+
+    def __init__(self, rate, capacity):
+        self.base_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """预定一个令牌，返回还需要等多少秒才能发请求（0 表示马上可以）"""
+        with self._lock:
+            now = time.monotonic()
+            # updated 可能在将来（被暂停到额度重置时间），那之前不补充令牌
+            elapsed = max(0.0, now - self.updated)
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = max(self.updated, now)
+
+            self.tokens -= 1
+            wait = self.updated - now
+            if self.tokens < 0:
+                wait += -self.tokens / self.rate
+            return wait
+
+    def pause_until(self, resume_at, tokens=None):
+        """额度用完：到 resume_at（monotonic 时间）之前不再放行，之后桶里有 tokens 个令牌"""
+        with self._lock:
+            self.updated = max(self.updated, resume_at)
+            self.tokens = self.capacity if tokens is None else min(self.capacity, tokens)
+
+    def tune(self, remaining, reset_in):
+        """还剩 remaining 次额度、reset_in 秒后重置：把速度调到刚好用到重置（不超过配置的速度）"""
+        with self._lock:
+            self.tokens = min(self.tokens, remaining)
+            self.rate = min(self.base_rate, max(remaining / max(reset_in, 1.0), 1e-3))
+
+
+class HostRateLimiter:
+    """
+    按主机名分别限流（线程安全）
+
+    default_rate / default_burst: 没有单独配置的主机用这个速度和突发量
+    rules: {主机名: (每秒请求数, 突发量)}
+    """
+
+    def __init__(self, default_rate=5.0, default_burst=10, rules=None):
+        self.default_rate = default_rate
+        self.default_burst = default_burst
+        self.rules = dict(rules or {})
+        self._buckets = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.rules.get(host, (self.default_rate, self.default_burst))
+                bucket = self._buckets[host] = TokenBucket(rate, burst)
+                self._stats[host] = {'requests': 0, 'waited': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+            return bucket
+
+    def _reserve(self, url):
+        host = urlsplit(url).hostname or ''
+        wait = self.bucket_for(host).reserve()
+        with self._lock:
+            stats = self._stats[host]
+            stats['requests'] += 1
+            if wait > 0:
+                stats['waited'] += 1
+                stats['total_wait'] += wait
+                stats['max_wait'] = max(stats['max_wait'], wait)
+        return wait
+
+    def acquire(self, url):
+        """发请求前调用，需要时阻塞等待；返回等了多少秒"""
+        wait = self._reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url):
+        """asyncio 版本的 acquire，等待时不阻塞事件循环"""
+        import asyncio  # 能跑到这里 asyncio 早就导入了；放在这里，只用同步版本时不用导入它
+
+        wait = self._reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def update_from_response(self, url, response):
+        """根据响应头调整这个主机的速度：X-RateLimit-Remaining/Reset，或者 429 + Retry-After"""
+        host = urlsplit(url).hostname or ''
+        bucket = self.bucket_for(host)
+        headers = response.headers
+        now = time.monotonic()
+
+        if response.status_code == 429:
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            if retry_after is not None:
+                bucket.pause_until(now + retry_after, tokens=1)
+                return
+
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining = int(remaining)
+            reset = float(reset)
+        except ValueError:
+            return
+
+        # GitHub 给的是重置时刻的时间戳，有些API给的是还剩多少秒
+        reset_in = reset - time.time() if reset > 1e9 else reset
+        reset_in = max(0.0, reset_in)
+
+        if remaining <= 0:
+            limit = headers.get('X-RateLimit-Limit')
+            tokens = int(limit) if limit and limit.isdigit() else None
+            bucket.pause_until(now + reset_in, tokens=tokens)
+        else:
+            bucket.tune(remaining, reset_in)
+
+    def stats(self):
+        """每个主机的请求数、等待次数、总等待时间和最长一次等待"""
+        with self._lock:
+            return {host: dict(stats) for host, stats in self._stats.items()}
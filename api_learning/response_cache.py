@@ -0,0 +1,122 @@
+"""
+响应缓存（内存版）
+同一个URL在有效期（TTL）内再次请求时直接返回上次的响应，不走网络；
+缓存按条数和总字节数限制大小，超出时淘汰最久没用过的（LRU）
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from requests.models import PreparedRequest
+
+
+def cache_key(url, params=None):
+    """带参数的请求，用拼好参数后的完整URL当缓存的键"""
+    if not params:
+        return url
+    request = PreparedRequest()
+    request.prepare_url(url, params)
+    return request.url
+
+
+class ResponseCache:
+    """
+    TTL + LRU 响应缓存（线程安全）
+
+    default_ttl: 默认缓存秒数，0 表示不缓存
+    ttl_rules: {URL前缀: 缓存秒数}，按最长前缀匹配，用来给不同接口设置不同TTL
+    max_entries: 最多缓存多少条
+    max_bytes: 所有响应正文加起来最多多少字节
+    """
+
+    def __init__(self, default_ttl=300, ttl_rules=None, max_entries=256,
+                 max_bytes=10 * 1024 * 1024):
+        self.default_ttl = default_ttl
+        self.ttl_rules = sorted((ttl_rules or {}).items(), key=lambda rule: -len(rule[0]))
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()  # key -> (过期时间, 字节数, response)
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, url):
+        """这个URL应该缓存多少秒"""
+        for prefix, ttl in self.ttl_rules:
+            if url.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+    def get(self, key):
+        """命中返回响应的副本（from_cache=True），没命中或已过期返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, size, response = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        cached = copy.copy(response)
+        cached.from_cache = True
+        cached.elapsed = timedelta(0)
+        return cached
+
+    def put(self, key, response, ttl=None):
+        """缓存一个响应；只缓存状态码200的，TTL为0或正文太大的不缓存"""
+        if ttl is None:
+            ttl = self.ttl_for(key)
+        if ttl <= 0 or response.status_code != 200:
+            return
+
+        size = len(response.content)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, size, response)
+            self.total_bytes += size
+
+            # 超出条数或字节数限制，从最久没用过的开始淘汰
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.total_bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """命中/未命中/淘汰次数，以及当前缓存大小"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+            }
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,129 @@
+"""
+重试策略
+网络抖动、代理偶尔断一下、服务器临时过载（429/502/503/504）时自动重试：
+等待时间按指数增长（0.5s, 1s, 2s...）并加随机抖动，避免大家同时重试；
+服务器给了 Retry-After 就按它说的等；设置 deadline 后所有重试加起来不超过这个时间
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+RETRY_STATUSES = (429, 502, 503, 504)
+MIN_TIMEOUT = 0.001  # requests 不接受 <= 0 的超时
+
+
+def parse_retry_after(value):
+    """Retry-After 可以是秒数，也可以是HTTP日期；解析不了返回 None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _cap_timeout(timeout, remaining):
+    # 单次请求的超时不能超过整体剩余时间；timeout 也可能是 (连接超时, 读取超时)
+    remaining = max(remaining, MIN_TIMEOUT)
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+    return min(timeout, remaining)
+
+
+class RetryPolicy:
+    """
+    max_attempts: 最多请求几次（包括第一次）
+    backoff: 第一次重试前的基础等待秒数，之后每次翻倍
+    max_backoff: 单次等待的上限
+    jitter: 在 [0, 等待时间] 之间随机取值（full jitter）
+    retry_statuses: 哪些状态码要重试
+    respect_retry_after: 服务器给了 Retry-After 时按它等待
+    max_retry_after: Retry-After 超过这个秒数就不等了，直接返回响应
+    deadline: 从第一次请求开始，所有尝试加起来最多花多少秒（None 表示不限制）
+    retry_exceptions: 哪些异常要重试，默认是 requests 的连接错误和超时
+    """
+
+    def __init__(self, max_attempts=3, backoff=0.5, max_backoff=10, jitter=True,
+                 retry_statuses=RETRY_STATUSES, respect_retry_after=True,
+                 max_retry_after=60, deadline=None, retry_exceptions=None):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.deadline = deadline
+        if retry_exceptions is None:
+            # 用到时才导入 requests，rate_limiter 只用 parse_retry_after 时不用付这个代价
+            import requests
+            retry_exceptions = (requests.ConnectionError, requests.Timeout)
+        self.retry_exceptions = retry_exceptions
+
+        self.attempts = 0
+        self.retries = 0
+
+    def backoff_for(self, attempt):
+        """第 attempt 次失败后要等多少秒"""
+        delay = min(self.max_backoff, self.backoff * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def call(self, send, timeout):
+        """
+        按策略执行 send(timeout)，send 返回 requests.Response
+        重试次数用完或时间预算用完时：最后一次是响应就返回它，是异常就抛出
+        """
+        start = time.monotonic()
+        attempt = 0
+
+        while True:
+            attempt += 1
+            attempt_timeout = timeout
+            if self.deadline is not None:
+                remaining = self.deadline - (time.monotonic() - start)
+                if remaining <= 0 and attempt > 1:
+                    break  # sleep 睡过了头，时间预算已经用完：按上一次的结果返回或抛出
+                attempt_timeout = _cap_timeout(timeout, remaining)
+
+            self.attempts += 1
+            error = response = None
+            try:
+                response = send(attempt_timeout)
+            except self.retry_exceptions as e:
+                error = e
+            else:
+                if response.status_code not in self.retry_statuses:
+                    return response
+
+            if attempt >= self.max_attempts:
+                break
+
+            delay = None
+            if response is not None and self.respect_retry_after:
+                delay = parse_retry_after(response.headers.get('Retry-After'))
+                if delay is not None and delay > self.max_retry_after:
+                    break
+            if delay is None:
+                delay = self.backoff_for(attempt)
+
+            # 等完之后已经没时间再请求一次了，就不等了
+            if self.deadline is not None and time.monotonic() - start + delay >= self.deadline:
+                break
+
+            if response is not None:
+                response.close()
+            self.retries += 1
+            time.sleep(delay)
+
+        if error is not None:
+            raise error
+        return response
@@ -0,0 +1,113 @@
+"""
+合并重复的并发请求（single-flight）
+好几个线程同时请求同一个URL时，只让第一个真正发请求，其余的等它完成后直接拿同一个结果，
+不会各自建连接、各自消耗限流额度。请求完成后就不再合并（这不是缓存，缓存见 response_cache.py）。
+"""
+
+import threading
+
+
+class _Call:
+    """一次正在进行的请求，等待它的调用方共享结果"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    同一个 key 同一时间只执行一次（线程安全）
+    do() 给线程用，do_async() 给 asyncio 协程用；两者各自合并，互不影响
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._async_calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0  # 真正执行的次数
+        self.coalesced = 0  # 直接用了别人结果的次数
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        执行 func(*args, **kwargs)；同一个 key 已经有线程在执行时，等它完成并返回同一个结果
+        （它抛异常时，等待的调用方也会收到同一个异常）
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key, func, *args, **kwargs):
+        """
+        asyncio 版本：func 是协程函数，同一个 key 的并发调用只 await 一次
+        执行的那个协程被取消时，只有它自己收到 CancelledError：
+        等待方里的一个接着重新执行 func，其余的继续等它
+        """
+        import asyncio  # 协程里 asyncio 肯定已经导入了；只用线程版本时不用导入它
+
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        while True:
+            with self._lock:
+                future = self._async_calls.get((loop, key))
+                if future is None:
+                    future = self._async_calls[(loop, key)] = loop.create_future()
+                    self.executed += 1
+                    leader = True
+                else:
+                    self.coalesced += 1
+                    leader = False
+
+            if leader:
+                break
+            try:
+                # shield：某个等待方被取消时，不影响其他等待方
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # future 被取消说明是执行的协程被取消了，不是自己：重新来一轮，抢着当执行方
+                if future.cancelled() and not task.cancelling():
+                    continue
+                raise
+
+        try:
+            result = await func(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # 标记异常已取出，没有等待方时也不会报警告
+            raise
+        finally:
+            with self._lock:
+                del self._async_calls[(loop, key)]
+
+    def stats(self):
+        with self._lock:
+            return {'executed': self.executed, 'coalesced': self.coalesced}
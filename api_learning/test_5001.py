@@ -3,9 +3,9 @@
 """
 
 import requests
-import urllib3
 
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+from cassette import install_from_env
+from event_log import RULE, log
 
 
 def test_port_5001():
@@ -14,9 +14,7 @@ def test_port_5001():
     port = 5001
     test_url = "https://httpbin.org/ip"
 
-    print("=" * 60)
-    print("测试5001端口 - HTTP代理")
-    print("=" * 60)
+    log.info('port5001.try', RULE + "\n测试5001端口 - {label}代理\n" + RULE, label='HTTP')
 
     proxies_http = {
         'http': f'http://127.0.0.1:{port}',
@@ -27,19 +25,18 @@ def test_port_5001():
         response = requests.get(test_url, proxies=proxies_http, timeout=10, verify=False)
         if response.status_code == 200:
             data = response.json()
-            print(f"✓ HTTP代理成功！")
-            print(f"   你的IP: {data['origin']}")
-            print(f"   推荐配置: proxies = {proxies_http}")
+            log.info('port5001.ok', "✓ {label}代理成功！\n   你的IP: {origin}\n"
+                     "   推荐配置: proxies = {proxies}",
+                     label='HTTP', origin=data['origin'], proxies=proxies_http)
             return 'http', True
         else:
-            print(f"✗ HTTP失败，状态码: {response.status_code}")
+            log.warning('port5001.failed', "✗ {label}失败，状态码: {status}",
+                        label='HTTP', status=response.status_code)
     except Exception as e:
-        print(f"✗ HTTP失败: {type(e).__name__}")
-        print(f"   {str(e)[:100]}")
+        log.warning('port5001.error', "✗ {label}失败: {error}\n   {detail}",
+                    label='HTTP', error=type(e).__name__, detail=str(e)[:100])
 
-    print("\n" + "=" * 60)
-    print("测试5001端口 - SOCKS5代理")
-    print("=" * 60)
+    log.info('port5001.try', "\n" + RULE + "\n测试5001端口 - {label}代理\n" + RULE, label='SOCKS5')
 
     proxies_socks5 = {
         'http': f'socks5://127.0.0.1:{port}',
@@ -50,15 +47,16 @@ def test_port_5001():
         response = requests.get(test_url, proxies=proxies_socks5, timeout=10, verify=False)
         if response.status_code == 200:
             data = response.json()
-            print(f"✓ SOCKS5代理成功！")
-            print(f"   你的IP: {data['origin']}")
-            print(f"   推荐配置: proxies = {proxies_socks5}")
+            log.info('port5001.ok', "✓ {label}代理成功！\n   你的IP: {origin}\n"
+                     "   推荐配置: proxies = {proxies}",
+                     label='SOCKS5', origin=data['origin'], proxies=proxies_socks5)
             return 'socks5', True
         else:
-            print(f"✗ SOCKS5失败，状态码: {response.status_code}")
+            log.warning('port5001.failed', "✗ {label}失败，状态码: {status}",
+                        label='SOCKS5', status=response.status_code)
     except Exception as e:
-        print(f"✗ SOCKS5失败: {type(e).__name__}")
-        print(f"   {str(e)[:100]}")
+        log.warning('port5001.error', "✗ {label}失败: {error}\n   {detail}",
+                    label='SOCKS5', error=type(e).__name__, detail=str(e)[:100])
 
     return None, False
 
@@ -66,18 +64,14 @@ def test_port_5001():
 def test_apis_with_5001():
     """用5001端口测试之前失败的API"""
 
-    print("\n" + "🚀" * 30)
-    print("用5001端口测试实际API")
-    print("🚀" * 30)
+    log.info('port5001.start', "\n" + "🚀" * 30 + "\n用5001端口测试实际API\n" + "🚀" * 30)
 
     # 先测试哪种代理类型可用
     proxy_type, success = test_port_5001()
 
     if not success:
-        print("\n✗ 5001端口不可用，请检查:")
-        print("  1. 代理软件是否正在运行")
-        print("  2. 端口是否正确（5001）")
-        print("  3. 代理类型是HTTP还是SOCKS5")
+        log.error('port5001.unavailable', "\n✗ 5001端口不可用，请检查:\n  1. 代理软件是否正在运行\n"
+                  "  2. 端口是否正确（5001）\n  3. 代理类型是HTTP还是SOCKS5")
         return
 
     # 配置代理
@@ -93,7 +87,7 @@ def test_apis_with_5001():
             'https': f'socks5://127.0.0.1:{port}',
         }
 
-    print(f"\n✓ 使用配置: {proxies}\n")
+    log.info('port5001.config', "\n✓ 使用配置: {proxies}\n", proxies=proxies)
 
     # 测试之前失败的API
     apis = [
@@ -106,46 +100,49 @@ def test_apis_with_5001():
     success_count = 0
 
     for url, name in apis:
-        print("=" * 60)
-        print(f"测试: {name}")
-        print("=" * 60)
+        log.info('port5001.api', RULE + "\n测试: {name}\n" + RULE, name=name, url=url)
 
         try:
             response = requests.get(url, proxies=proxies, timeout=10, verify=False)
 
             if response.status_code == 200:
                 data = response.json()
-                print(f"✓ 成功！")
+                log.info('port5001.api_ok', "✓ 成功！", name=name)
                 success_count += 1
 
                 # 显示部分数据
                 if 'setup' in data:  # 笑话
-                    print(f"   {data['setup']}")
-                    print(f"   👉 {data['punchline']}")
+                    log.info('port5001.data', "   {setup}\n   👉 {punchline}",
+                             setup=data['setup'], punchline=data['punchline'])
                 elif 'fact' in data:  # 猫咪知识
-                    print(f"   🐱 {data['fact']}")
+                    log.info('port5001.data', "   🐱 {fact}", fact=data['fact'])
                 elif 'results' in data:  # 随机用户
                     user = data['results'][0]
-                    print(f"   👤 {user['name']['first']} {user['name']['last']}")
-                    print(f"   📧 {user['email']}")
+                    log.info('port5001.data', "   👤 {first} {last}\n   📧 {email}",
+                             first=user['name']['first'], last=user['name']['last'],
+                             email=user['email'])
                 elif 'ip' in data:  # IP信息
-                    print(f"   🌍 IP: {data.get('ip')}")
-                    print(f"   📍 {data.get('city')}, {data.get('country_name')}")
+                    log.info('port5001.data', "   🌍 IP: {ip}\n   📍 {city}, {country}",
+                             ip=data.get('ip'), city=data.get('city'),
+                             country=data.get('country_name'))
             else:
-                print(f"✗ 失败，状态码: {response.status_code}")
+                log.warning('port5001.api_failed', "✗ 失败，状态码: {status}\n",
+                            name=name, status=response.status_code)
 
         except Exception as e:
-            print(f"✗ 失败: {type(e).__name__}")
-            print(f"   {str(e)[:100]}")
+            log.warning('port5001.api_error', "✗ 失败: {error}\n   {detail}\n",
+                        name=name, error=type(e).__name__, detail=str(e)[:100])
 
-        print()
-
-    print("=" * 60)
-    print(f"📊 成功: {success_count}/{len(apis)} 个API")
-    print("=" * 60)
+    log.info('port5001.summary', RULE + "\n📊 成功: {ok}/{total} 个API\n" + RULE,
+             ok=success_count, total=len(apis))
 
 
 if __name__ == "__main__":
+    import urllib3
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    install_from_env()  # 设置了 API_CASSETTE 环境变量时离线录制 / 回放
+
     test_apis_with_5001()
 
     print("\n" + "=" * 60)
@@ -0,0 +1,82 @@
+"""
+cassette 测试
+先对着本地服务器录制，再关掉服务器回放：回放的响应要和真的一样能用，
+包括 stream=True / iter_content（APIClient.stream_items 就是这样读的）和 close()
+"""
+
+import os
+import tempfile
+
+import requests
+
+from api_client import APIClient
+from cassette import Cassette
+from local_server import LocalServer
+
+ITEMS = [{'id': i, 'name': f'item {i}'} for i in range(1000)]
+
+
+def _items_route(path, query, headers):
+    return 200, ITEMS
+
+
+def record(path):
+    """录制一次 /items，返回服务器地址（录完服务器就关了）"""
+    with LocalServer(routes={'/items': _items_route}) as server, \
+            Cassette(path, mode='record'), APIClient() as client:
+        assert list(client.stream_items(f'{server.url}/items')) == ITEMS
+        return server.url
+
+
+def test_stream_replay():
+    """回放时用 stream_items 边"下载"边解析，小块读也要拿到完整的数组"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'items.json.gz')
+        url = record(path) + '/items'
+
+        with Cassette(path, mode='replay') as cassette, APIClient() as client:
+            assert list(client.stream_items(url, chunk_size=100)) == ITEMS
+            assert cassette.replayed == 1
+    print(f"✓ stream_items 回放: {len(ITEMS)} 个元素")
+
+
+def test_raw_and_close():
+    """回放的响应有 raw，可以直接读，close() 也不会出错"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'items.json.gz')
+        url = record(path) + '/items'
+
+        with Cassette(path, mode='replay'):
+            response = requests.get(url, stream=True)
+            chunks = list(response.iter_content(4096))
+            assert b''.join(chunks) == response.content
+            assert len(chunks) > 1
+            response.close()
+
+            response = requests.get(url, stream=True)
+            assert response.raw.read() == response.content
+            response.close()
+    print("✓ 回放的响应可以直接读 raw，也可以 close()")
+
+
+def test_replay_miss():
+    """replay 模式下没录过的请求抛 ConnectionError"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'items.json.gz')
+        url = record(path)
+
+        with Cassette(path, mode='replay'):
+            try:
+                requests.get(url + '/other')
+            except requests.ConnectionError:
+                pass
+            else:
+                raise AssertionError('没录过的请求应该抛 ConnectionError')
+    print("✓ 没录过的请求抛 ConnectionError")
+
+
+if __name__ == "__main__":
+    test_stream_replay()
+    test_raw_and_close()
+    test_replay_miss()
+    print("\n🎉 全部通过")
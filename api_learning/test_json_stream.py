@@ -0,0 +1,122 @@
+"""
+流式JSON解析测试
+正常的数组不管怎么切块都要解析出和 json.loads 一样的结果；格式错误的输入都要抛 ValueError
+"""
+
+import json
+import time
+
+from json_stream import iter_json_array
+
+VALID = [
+    '[]',
+    '  [ ]  ',
+    '[1]',
+    '[1, 2.5, -3e2, "a,]b", null, true, false]',
+    '[{"a": [1, 2]}, {"b": {"c": "]"}}]',
+    '[[], [[]], {}]\n',
+    '["中文", "😀"]',
+]
+
+MALFORMED = [
+    '[1 2]',               # 缺少逗号
+    '[{"a":1}{"b":2}]',    # 对象之间缺少逗号
+    '[,1]',                # 开头多了逗号
+    '[1,,2]',              # 连续两个逗号
+    '[1,]',                # 结尾多了逗号
+    '[,]',
+    '[1] garbage',         # ] 后面还有内容
+    '[1] ]',
+    '[1][2]',
+    '[1, 2',               # 不完整
+    '[',
+    '',
+    '{"a": 1}',            # 顶层不是数组
+    '[1, tru]',            # 元素本身格式错误
+]
+
+
+def split_every(text, size):
+    data = text.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_valid():
+    """每种切块大小（包括把多字节字符切开）都和 json.loads 结果一样"""
+    for text in VALID:
+        for size in (1, 2, 3, 7, 1000):
+            assert list(iter_json_array(split_every(text, size))) == json.loads(text), (text, size)
+    print(f"✓ {len(VALID)} 个正常数组，各种切块大小都解析正确")
+
+
+def test_malformed():
+    """格式错误的输入（不管怎么切块）都抛 ValueError"""
+    for text in MALFORMED:
+        for size in (1, 3, 1000):
+            try:
+                list(iter_json_array(split_every(text, size)))
+            except ValueError:
+                continue
+            raise AssertionError(f'应该抛 ValueError: {text!r}（每块 {size} 字节）')
+    print(f"✓ {len(MALFORMED)} 个格式错误的输入都抛 ValueError")
+
+
+def test_trailing_whitespace_drained():
+    """] 后面的数据也会读完：只有空白没问题，后面的块里有内容也能发现"""
+    assert list(iter_json_array([b'[1, 2]', b'  \n', b'\t'])) == [1, 2]
+    try:
+        list(iter_json_array([b'[1, 2]', b'  ', b'x']))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('] 后面的块里有内容应该抛 ValueError')
+    print("✓ ] 后面的块也会检查，只允许空白")
+
+
+def test_large_element():
+    """
+    一个几MB的元素分成很多小块：不能每来一块都从头重新解析（以前要几秒），
+    和 json.loads 同一个数量级
+    """
+    item = {'body': 'x' * 2_000_000, 'rows': [{'id': i, 'name': '名字'} for i in range(50_000)]}
+    text = json.dumps([item], ensure_ascii=False)
+
+    start = time.perf_counter()
+    json.loads(text)
+    loads_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert list(iter_json_array(split_every(text, 64 * 1024))) == [item]
+    stream_time = time.perf_counter() - start
+    assert stream_time < 10 * loads_time + 0.5, (stream_time, loads_time)
+    print(f"✓ {len(text) / 1e6:.1f}MB 的单个元素: {stream_time:.2f}s（json.loads {loads_time:.2f}s）")
+
+
+def test_malformed_fails_early():
+    """元素中间有不可能合法的内容时马上报错，不会把后面的数据一直读下去"""
+    read = []
+
+    def chunks():
+        yield b'[{"a" 1, '
+        for i in range(10_000):
+            read.append(i)
+            yield b'"padding padding", '
+        yield b'"end"}]'
+
+    try:
+        list(iter_json_array(chunks()))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('应该抛 ValueError')
+    assert len(read) < 10, len(read)
+    print(f"✓ 格式错误的元素读了 {len(read)} 块就报错")
+
+
+if __name__ == "__main__":
+    test_valid()
+    test_malformed()
+    test_trailing_whitespace_drained()
+    test_large_element()
+    test_malformed_fails_early()
+    print("\n🎉 全部通过")
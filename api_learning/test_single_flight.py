@@ -0,0 +1,148 @@
+"""
+请求合并（single-flight）测试
+100 个线程 / 100 个协程同时请求本地服务器的同一个URL，服务器应该只收到 1 个请求
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from api_client import APIClient
+from async_fetch import fetch_many
+from local_server import LocalServer
+from single_flight import SingleFlight
+
+CALLERS = 100
+RESPONSE_DELAY = 0.3  # 让第一个请求在途足够久，其他调用方都能赶上
+
+
+def test_threads():
+    """100 个线程同时请求同一个URL"""
+    barrier = threading.Barrier(CALLERS)
+
+    with LocalServer(response_delay=RESPONSE_DELAY) as server, \
+            APIClient(pool_maxsize=CALLERS, single_flight=SingleFlight()) as client:
+        url = f'{server.url}/json/'
+
+        def call(_):
+            barrier.wait()  # 所有线程准备好后同时发
+            return client.get_json(url)
+
+        with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+            results = list(executor.map(call, range(CALLERS)))
+
+        assert server.request_count == 1, f'服务器收到 {server.request_count} 个请求'
+        assert all(result == results[0] for result in results)
+        assert client.single_flight.stats() == {'executed': 1, 'coalesced': CALLERS - 1}
+    print(f"✓ 线程: {CALLERS} 个并发调用，服务器只收到 1 个请求")
+
+
+def test_async_fetch():
+    """asyncio：fetch_many 同时发 100 个相同的URL"""
+    with LocalServer(response_delay=RESPONSE_DELAY) as server, \
+            APIClient(pool_maxsize=CALLERS, single_flight=SingleFlight()) as client:
+        urls = [f'{server.url}/json/'] * CALLERS
+        results = asyncio.run(fetch_many(urls, concurrency=CALLERS, client=client))
+
+        assert server.request_count == 1, f'服务器收到 {server.request_count} 个请求'
+        assert all(result == results[0] for result in results) and results[0] is not None
+    print(f"✓ asyncio: {CALLERS} 个并发调用，服务器只收到 1 个请求")
+
+
+def test_do_async():
+    """do_async：协程直接用 SingleFlight，异常也会传给所有等待方"""
+    flight = SingleFlight()
+    calls = []
+
+    async def slow_lookup(name):
+        calls.append(name)
+        await asyncio.sleep(0.05)
+        return {'name': name}
+
+    async def failing():
+        await asyncio.sleep(0.05)
+        raise ValueError('boom')
+
+    async def main():
+        results = await asyncio.gather(
+            *(flight.do_async('user', slow_lookup, 'torvalds') for _ in range(CALLERS)))
+        errors = await asyncio.gather(
+            *(flight.do_async('bad', failing) for _ in range(10)), return_exceptions=True)
+        return results, errors
+
+    results, errors = asyncio.run(main())
+    assert calls == ['torvalds']
+    assert all(result == {'name': 'torvalds'} for result in results)
+    assert all(isinstance(error, ValueError) for error in errors)
+    print(f"✓ do_async: {CALLERS} 个协程只执行 1 次，异常也共享")
+
+
+def test_leader_cancelled():
+    """do_async：执行的协程被取消时，等待方不跟着被取消，其中一个接着执行"""
+    flight = SingleFlight()
+    calls = []
+
+    async def slow_lookup(name):
+        calls.append(name)
+        await asyncio.sleep(0.1)
+        return {'name': name}
+
+    async def main():
+        leader = asyncio.ensure_future(flight.do_async('user', slow_lookup, 'torvalds'))
+        await asyncio.sleep(0.01)  # 让它先成为执行方
+        waiters = [asyncio.ensure_future(flight.do_async('user', slow_lookup, 'torvalds'))
+                   for _ in range(10)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+        try:
+            await leader
+        except asyncio.CancelledError:
+            return results
+        raise AssertionError('执行的协程应该被取消')
+
+    results = asyncio.run(main())
+    assert len(calls) == 2, f'func 执行了 {len(calls)} 次'
+    assert all(result == {'name': 'torvalds'} for result in results)
+    print("✓ 执行的协程被取消后，等待方里的一个接着执行，其余的都拿到结果")
+
+
+def test_headers_not_shared():
+    """请求头（比如 Authorization）不同的并发请求不能合并，相同的照样合并"""
+    def whoami(path, query, headers):
+        return 200, {'user': headers.get('Authorization')}
+
+    callers = [{'Authorization': 'token alice'}, {'Authorization': 'token bob'}] * 5
+    barrier = threading.Barrier(len(callers))
+
+    with LocalServer(routes={'/me': whoami}, response_delay=RESPONSE_DELAY) as server, \
+            APIClient(pool_maxsize=len(callers), single_flight=SingleFlight()) as client:
+        def call(headers):
+            barrier.wait()
+            return client.get_json(f'{server.url}/me', headers=headers)
+
+        with ThreadPoolExecutor(max_workers=len(callers)) as executor:
+            results = list(executor.map(call, callers))
+
+        assert [result['user'] for result in results] == [h['Authorization'] for h in callers]
+        assert server.request_count == 2, f'服务器收到 {server.request_count} 个请求'
+    print("✓ 不同 Authorization 的请求各发各的，相同的仍然合并")
+
+
+def test_sequential_not_coalesced():
+    """前一个请求完成后再请求，应该重新发（合并不是缓存）"""
+    with LocalServer() as server, APIClient(single_flight=SingleFlight()) as client:
+        for _ in range(3):
+            client.get_json(f'{server.url}/json/')
+        assert server.request_count == 3, f'服务器收到 {server.request_count} 个请求'
+    print("✓ 顺序请求不会被合并")
+
+
+if __name__ == "__main__":
+    test_threads()
+    test_async_fetch()
+    test_do_async()
+    test_leader_cancelled()
+    test_headers_not_shared()
+    test_sequential_not_coalesced()
+    print("\n🎉 全部通过")
@@ -3,95 +3,78 @@ V2RayN 代理配置测试
 """
 
 import requests
-import urllib3
-
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-
-
-def test_v2ray_configs():
-    """测试V2RayN的多种可能配置"""
-
-    print("🚀 测试 V2RayN 代理配置\n")
-
-    # V2RayN可能的配置组合
-    configs = [
-        {
-            'name': 'SOCKS5 - 端口5001',
-            'proxies': {
-                'http': 'socks5://127.0.0.1:5001',
-                'https': 'socks5://127.0.0.1:5001',
-            }
-        },
-        {
-            'name': 'SOCKS5H - 端口5001 (DNS通过代理)',
-            'proxies': {
-                'http': 'socks5h://127.0.0.1:5001',
-                'https': 'socks5h://127.0.0.1:5001',
-            }
-        },
-        {
-            'name': 'HTTP - 端口10809',
-            'proxies': {
-                'http': 'http://127.0.0.1:10809',
-                'https': 'http://127.0.0.1:10809',
-            }
-        },
-        {
-            'name': 'HTTP - 端口10808',
-            'proxies': {
-                'http': 'http://127.0.0.1:10808',
-                'https': 'http://127.0.0.1:10808',
-            }
-        },
-    ]
+
+from cassette import install_from_env
+from event_log import RULE, log
+from find_proxy import TEST_URL
+from proxy_discovery import DEFAULT_CACHE_PATH, check_cached_proxy, save_proxy
+from proxy_pool import V2RAY_CONFIGS
+
+# 找到可用配置后，用它测试这几个实际的API
+TEST_APIS = [
+    ("https://official-joke-api.appspot.com/random_joke", "笑话API"),
+    ("https://randomuser.me/api/", "随机用户API"),
+    ("https://catfact.ninja/fact", "猫咪知识API"),
+]
+
+
+def test_v2ray_configs(configs=V2RAY_CONFIGS, test_url=TEST_URL, test_apis=TEST_APIS,
+                       cache_path=DEFAULT_CACHE_PATH):
+    """
+    测试V2RayN的多种可能配置
+    没有外网时可以传入 mock_server 的代理配置、/ip 地址和 API 列表，
+    再传 cache_path=None：不读也不写代理缓存，测试结果不会覆盖真正的 .proxy_cache.json
+    """
+
+    log.info('v2ray.start', "🚀 测试 V2RayN 代理配置\n")
 
     working_config = None
 
-    for config in configs:
-        print("=" * 60)
-        print(f"测试配置: {config['name']}")
-        print("=" * 60)
-        print(f"proxies = {config['proxies']}\n")
-
-        try:
-            response = requests.get(
-                'https://httpbin.org/ip',
-                proxies=config['proxies'],
-                timeout=10,
-                verify=False
-            )
-
-            if response.status_code == 200:
-                data = response.json()
-                print(f"✓ 成功！")
-                print(f"   你的代理IP: {data['origin']}")
-                working_config = config
-                break  # 找到可用的就停止
-            else:
-                print(f"✗ 失败，状态码: {response.status_code}")
-
-        except Exception as e:
-            print(f"✗ 失败: {type(e).__name__}")
-            print(f"   {str(e)[:100]}\n")
+    # 先试上次找到的代理：一个请求就能确认，不用把所有配置挨个试一遍
+    cached = check_cached_proxy(cache_path, test_url=test_url) if cache_path else None
+    if cached:
+        log.info('v2ray.cached_ok', "⚡ 上次找到的代理仍然可用 ({latency_ms:.0f} ms)\n"
+                 "proxies = {config}\n", latency_ms=cached['latency'] * 1000, config=cached['config'])
+        working_config = {'name': cached.get('name', '上次找到的代理'), 'proxies': cached['config']}
 
-    if working_config:
-        print("\n" + "=" * 60)
-        print("🎉 找到可用配置！")
-        print("=" * 60)
+    if working_config is None:
+        for config in configs:
+            log.info('v2ray.try', RULE + "\n测试配置: {name}\n" + RULE + "\nproxies = {proxies}\n",
+                     name=config['name'], proxies=config['proxies'])
+
+            try:
+                response = requests.get(
+                    test_url,
+                    proxies=config['proxies'],
+                    timeout=10,
+                    verify=False
+                )
+
+                if response.status_code == 200:
+                    data = response.json()
+                    log.info('v2ray.ok', "✓ 成功！\n   你的代理IP: {origin}",
+                             name=config['name'], origin=data['origin'])
+                    working_config = config
+                    break  # 找到可用的就停止
+                else:
+                    log.warning('v2ray.failed', "✗ 失败，状态码: {status}",
+                                name=config['name'], status=response.status_code)
 
-        # 测试实际API
-        print("\n正在用这个配置测试实际API...\n")
+            except Exception as e:
+                log.warning('v2ray.error', "✗ 失败: {error}\n   {detail}\n",
+                            name=config['name'], error=type(e).__name__, detail=str(e)[:100])
+
+    if working_config:
+        if cache_path:
+            save_proxy({'name': working_config['name'], 'config': working_config['proxies']},
+                       cache_path)
 
-        test_apis = [
-            ("https://official-joke-api.appspot.com/random_joke", "笑话API"),
-            ("https://randomuser.me/api/", "随机用户API"),
-            ("https://catfact.ninja/fact", "猫咪知识API"),
-        ]
+        log.info('v2ray.found', "\n" + RULE + "\n🎉 找到可用配置！\n" + RULE
+                 + "\n\n正在用这个配置测试实际API...\n", name=working_config['name'])
 
         success_count = 0
 
         for url, name in test_apis:
-            print(f"测试 {name}...", end=" ")
             try:
                 response = requests.get(
                     url,
@@ -100,36 +83,37 @@ def test_v2ray_configs():
                     verify=False
                 )
                 if response.status_code == 200:
-                    print("✓ 成功")
+                    log.info('v2ray.api_ok', "测试 {name}... ✓ 成功", name=name, url=url)
                     success_count += 1
                 else:
-                    print(f"✗ 失败 ({response.status_code})")
+                    log.warning('v2ray.api_failed', "测试 {name}... ✗ 失败 ({status})",
+                                name=name, url=url, status=response.status_code)
             except Exception as e:
-                print(f"✗ 失败 ({type(e).__name__})")
+                log.warning('v2ray.api_error', "测试 {name}... ✗ 失败 ({error})",
+                            name=name, url=url, error=type(e).__name__)
 
-        print(f"\n成功: {success_count}/{len(test_apis)}")
+        log.info('v2ray.api_summary', "\n成功: {ok}/{total}", ok=success_count, total=len(test_apis))
 
         # 推荐配置
-        print("\n" + "=" * 60)
-        print("💾 推荐配置代码:")
-        print("=" * 60)
-        print(f"""
+        log.info('v2ray.recommend', "\n" + RULE + "\n💾 推荐配置代码:\n" + RULE + """
 # 在你的代码开头添加:
-proxies = {working_config['proxies']}
+proxies = {proxies}
 
 # 使用方法:
 response = requests.get(url, proxies=proxies, verify=False)
-        """)
+""", proxies=working_config['proxies'])
 
     else:
-        print("\n" + "=" * 60)
-        print("✗ 所有配置都失败了")
-        print("=" * 60)
-        print("\n请检查:")
-        print("1. V2RayN 是否正在运行？")
-        print("2. 点击 V2RayN 的'设置'标签，查看HTTP代理端口")
-        print("3. 截图'设置'页面给我看")
+        log.error('v2ray.all_failed', "\n" + RULE + "\n✗ 所有配置都失败了\n" + RULE
+                  + "\n\n请检查:\n1. V2RayN 是否正在运行？\n"
+                  "2. 点击 V2RayN 的'设置'标签，查看HTTP代理端口\n3. 截图'设置'页面给我看",
+                  tried=len(configs))
 
 
 if __name__ == "__main__":
+    import urllib3
+
+    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+    install_from_env()  # 设置了 API_CASSETTE 环境变量时离线录制 / 回放
+
     test_v2ray_configs()
\ No newline at end of file